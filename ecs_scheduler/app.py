@@ -18,21 +18,22 @@ def create():
     :returns: The flask server instance
     """
     try:
-        env.init()
-
-        _logger.info('ECS Scheduler v%s', env.get_version())
         app = webapi.create()
 
         try:
             from uwsgidecorators import postfork
-            postfork(functools.partial(_setup_application, app))
         except ImportError:
             # NOTE: Flask in debug mode will restart after initial startup
-            # so only setup application state in the main Flask process
-            # to avoid duplicate daemons and other side-effects
+            # so only initialize and setup application state in the main
+            # Flask process to avoid duplicate daemons, wasted startup work
+            # in the reloader process, and other side-effects
             # see: https://github.com/pallets/werkzeug/blob/master/werkzeug/_reloader.py
             if werkzeug.serving.is_running_from_reloader() or not app.debug:
+                _init_environment()
                 _setup_application(app)
+        else:
+            _init_environment()
+            postfork(functools.partial(_setup_application, app))
 
         return app
     except Exception:
@@ -40,6 +41,11 @@ def create():
         raise
 
 
+def _init_environment():
+    env.init()
+    _logger.info('ECS Scheduler v%s', env.get_version())
+
+
 def _setup_application(app):
     ops_queue = operations.DirectQueue()
     jobs_dc = datacontext.Jobs.load()
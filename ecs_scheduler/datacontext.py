@@ -7,32 +7,17 @@ Jobs and Job represent job storage and individual jobs, respectively.
 Job data is controlled by the schemas in ecs_scheduler.serialization module.
 All job loading and storing exceptions inherit from JobError.
 """
-import collections.abc
-import functools
 import logging
-from threading import RLock
+import types
+from threading import Lock
 
 from . import persistence
 from .serialization import JobSchema, JobCreateSchema
 
 
 _logger = logging.getLogger(__name__)
-
-
-def _sync(f):
-    @functools.wraps(f)
-    def wrapper(self, *args, **kwargs):
-        with self._lock:
-            return f(self, *args, **kwargs)
-    return wrapper
-
-
-def _sync_yield(f):
-    @functools.wraps(f)
-    def wrapper(self, *args, **kwargs):
-        with self._lock:
-            yield from f(self, *args, **kwargs)
-    return wrapper
+_job_schema = JobSchema()
+_job_create_schema = JobCreateSchema()
 
 
 class Jobs:
@@ -41,6 +26,8 @@ class Jobs:
 
     A job data context used by the application to load and store jobs.
     """
+    __slots__ = ('_schema', '_store', '_lock', '_jobs')
+
     @classmethod
     def load(cls, store=None):
         """
@@ -65,12 +52,13 @@ class Jobs:
 
         :param store: The data store to use for loading and storing jobs
         """
-        self._schema = JobCreateSchema()
+        self._schema = _job_create_schema
         self._store = store
-        self._lock = RLock()
+        # NOTE: the jobs dict is copy-on-write; only mutations take the lock
+        # and readers work off whichever snapshot is current when they start
+        self._lock = Lock()
         self._jobs = None
 
-    @_sync
     def total(self):
         """
         Get the total number of jobs.
@@ -79,16 +67,15 @@ class Jobs:
         """
         return len(self._jobs)
 
-    @_sync_yield
     def get_all(self):
         """
         Get all jobs.
 
-        :returns: A generator that yields all jobs in the job store
+        :returns: An iterator over a snapshot of all jobs in the job store;
+                  jobs created or deleted during iteration are not reflected
         """
-        yield from self._jobs.values()
+        return iter(self._jobs.values())
 
-    @_sync
     def get(self, job_id):
         """
         Get a job by id.
@@ -97,11 +84,11 @@ class Jobs:
         :returns: The job for the given id
         :raises: JobNotFound if job not found
         """
-        if job_id not in self._jobs:
-            raise JobNotFound(job_id)
-        return self._jobs[job_id]
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise JobNotFound(job_id) from None
 
-    @_sync
     def create(self, job_data):
         """
         Create a new job.
@@ -112,18 +99,19 @@ class Jobs:
         :raises: InvalidJobData if job fields fail validation
         :raises: JobPersistenceError if job creation fails
         """
-        job = self._create_job(job_data)
-        if job.id in self._jobs:
-            raise JobAlreadyExists(job.id)
-        try:
-            self._store.create(job.id, self._schema.dump(job.data).data)
-        except Exception as ex:
-            # TODO: inner exception not printed in flask logs :(
-            raise JobPersistenceError(job.id) from ex
-        self._jobs[job.id] = job
-        return job
-
-    @_sync
+        with self._lock:
+            job = self._create_job(job_data)
+            jobs = self._jobs.copy()
+            if jobs.setdefault(job.id, job) is not job:
+                raise JobAlreadyExists(job.id)
+            try:
+                self._store.create(job.id, self._schema.dump(job.data).data)
+            except Exception as ex:
+                # TODO: inner exception not printed in flask logs :(
+                raise JobPersistenceError(job.id) from ex
+            self._jobs = jobs
+            return job
+
     def delete(self, job_id):
         """
         Delete a job.
@@ -132,20 +120,31 @@ class Jobs:
         :raises: JobNotFound if job not found
         :raises: JobPersistenceError if job deletion fails
         """
-        if job_id not in self._jobs:
-            raise JobNotFound(job_id)
-        try:
-            self._store.delete(job_id)
-        except Exception as ex:
-            raise JobPersistenceError(job_id) from ex
-        del self._jobs[job_id]
+        with self._lock:
+            jobs = self._jobs.copy()
+            try:
+                del jobs[job_id]
+            except KeyError:
+                raise JobNotFound(job_id) from None
+            try:
+                self._store.delete(job_id)
+            except Exception as ex:
+                raise JobPersistenceError(job_id) from ex
+            self._jobs = jobs
 
     def _fill(self):
-        parsed_jobs = (
-            self._create_job(raw_data)
-            for raw_data in self._store.load_all()
+        jobs_data, errors = self._schema.load(
+            list(self._store.load_all()), many=True
         )
-        self._jobs = {job.id: job for job in parsed_jobs}
+        if errors:
+            first_invalid = min(errors)
+            raise InvalidJobData(
+                jobs_data[first_invalid].get('id'), errors[first_invalid]
+            )
+        self._jobs = {
+            job_data['id']: Job(job_data, self._store)
+            for job_data in jobs_data
+        }
 
     def _create_job(self, raw_data):
         job_data, errors = self._schema.load(raw_data)
@@ -159,9 +158,17 @@ class Job:
     A persistent job representing an ECS scheduled task.
 
     Stored and retrieved by a Jobs data context.
+
+    :attribute id: The job id string
+    :attribute suspended: The job suspended flag or False if not set
     """
     _RESERVED_FIELDS = {'id'}
 
+    __slots__ = (
+        '_schema', '_data', '_mapping', '_lock', '_store',
+        'id', 'suspended',
+    )
+
     def __init__(self, data, store):
         """
         Create a persistent job.
@@ -173,20 +180,13 @@ class Job:
         :param store: The data store to use for persistence,
                       provided by the Jobs instance
         """
-        self._schema = JobSchema()
+        self._schema = _job_schema
         self._data = data
-        self._mapping = JobDataMapping(self._data)
-        self._lock = RLock()
+        self._lock = Lock()
         self._store = store
-
-    @property
-    def id(self):
-        """
-        Get the job id.
-
-        :returns: The job id string
-        """
-        return self._data['id']
+        self.id = data['id']
+        self._mapping = types.MappingProxyType(self._data)
+        self._cache_fields()
 
     @property
     def data(self):
@@ -197,26 +197,20 @@ class Job:
         """
         return self._mapping
 
-    @property
-    def suspended(self):
-        """
-        Get the job suspended flag.
-
-        :returns: The job suspended flag or False if not set
-        """
-        return self.data.get('suspended', False)
-
     @property
     def parsed_schedule(self):
         """
         Get the parsed schedule.
 
+        Not cached like the other job fields so a job without a schedule
+        raises KeyError here instead of handing the scheduler None.
+
         :returns: A dictionary representation of the schedule
             mapped to the expected arguments of the scheduler trigger.
+        :raises: KeyError if the job has no parsed schedule
         """
-        return self.data['parsedSchedule']
+        return self._data['parsedSchedule']
 
-    @_sync
     def update(self, fields):
         """
         Update the job.
@@ -228,15 +222,17 @@ class Job:
         validated_fields, errors = self._schema.load(fields)
         if errors:
             raise InvalidJobData(self.id, errors)
-        try:
-            self._store.update(
-                self.id, self._schema.dump(validated_fields).data
-            )
-        except Exception as ex:
-            raise JobPersistenceError(self.id) from ex
-        self._update_data(validated_fields)
+        # NOTE: hold the job lock across the store write so concurrent
+        # updates reach the store and the job data in the same order
+        with self._lock:
+            try:
+                self._store.update(
+                    self.id, self._schema.dump(validated_fields).data
+                )
+            except Exception as ex:
+                raise JobPersistenceError(self.id) from ex
+            self._update_data(validated_fields)
 
-    @_sync
     def annotate(self, fields):
         """
         Annotate the job.
@@ -260,47 +256,15 @@ class Job:
         if reserved_fields:
             raise ImmutableJobFields(self.id, reserved_fields)
 
-        self._update_data(fields)
+        with self._lock:
+            self._update_data(fields)
 
     def _update_data(self, fields):
         self._data.update(fields)
+        self._cache_fields()
 
-
-class JobDataMapping(collections.abc.Mapping):
-    """A read-only dictionary wrapper for job data."""
-
-    def __init__(self, data):
-        """
-        Create a mapping for the given dictionary.
-
-        :param data: The data dictionary to wrap
-        """
-        self._data = data
-
-    def __getitem__(self, key):
-        """
-        Get a value for the given key.
-
-        :param key: The key for the value to get
-        :returns: The value for the given key
-        """
-        return self._data[key]
-
-    def __iter__(self):
-        """
-        Iterate the underlying data.
-
-        :returns: An iterator for the underlying data
-        """
-        return iter(self._data)
-
-    def __len__(self):
-        """
-        The length of the data.
-
-        :returns: Length of the underlying data
-        """
-        return len(self._data)
+    def _cache_fields(self):
+        self.suspended = self._data.get('suspended', False)
 
 
 class JobError(Exception):
@@ -9,6 +9,9 @@ from . import triggers, __version__
 
 
 _logger = logging.getLogger(__name__)
+_log_formatter = logging.Formatter(
+    '%(levelname)s:%(name)s:%(asctime)s %(message)s'
+)
 
 
 def init():
@@ -27,7 +30,7 @@ def get_var(name, required=False, default=None):
     """
     name = f'ECSS_{name}'
     val = os.environ[name] if required else os.getenv(name, default)
-    return val.format(**os.environ) if val else val
+    return val.format_map(os.environ) if val else val
 
 
 def get_version():
@@ -41,6 +44,17 @@ def get_version():
 
 
 def _init_logging():
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return
+
+    # NOTE: the log format does not use thread or process info
+    # so skip collecting them for every log record
+    # see: https://docs.python.org/3/howto/logging.html#optimization
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     log_level = getattr(logging, get_var('LOG_LEVEL', default=''), None)
     log_handlers = [logging.StreamHandler()]
     log_folder = get_var('LOG_FOLDER')
@@ -52,8 +66,8 @@ def _init_logging():
                 log_file, maxBytes=5*1024*1024, backupCount=1
             )
         )
-    logging.basicConfig(
-        level=log_level,
-        handlers=log_handlers,
-        format='%(levelname)s:%(name)s:%(asctime)s %(message)s'
-    )
+    for handler in log_handlers:
+        handler.setFormatter(_log_formatter)
+        root_logger.addHandler(handler)
+    if log_level is not None:
+        root_logger.setLevel(log_level)
@@ -1,11 +1,19 @@
-from dataclasses import dataclass
 """
 Miscellaneous model classes.
 
-JobOperation communicates updates between the webapi and scheduler.
+JobOperation communicates updates between the webapi and scheduler
+using an OperationType label.
 
 Pagination is a simple model object for webapi pagination operations.
 """
+import enum
+
+
+class OperationType(enum.IntEnum):
+    """The kinds of job operations sent to the scheduler."""
+    ADD = 1
+    MODIFY = 2
+    REMOVE = 3
 
 
 class JobOperation:
@@ -17,9 +25,11 @@ class JobOperation:
     :attribute MODIFY: Modify operation label
     :attribute REMOVE: Remove operation label
     """
-    ADD = 1
-    MODIFY = 2
-    REMOVE = 3
+    ADD = OperationType.ADD
+    MODIFY = OperationType.MODIFY
+    REMOVE = OperationType.REMOVE
+
+    __slots__ = ('operation', 'job_id')
 
     @classmethod
     def add(cls, job_id):
@@ -55,23 +65,26 @@ class JobOperation:
         Use the factory class methods instead of __init___ directly
         to create an instance.
 
-        :param operation: The operation label
+        :param operation: The OperationType label
         :param job_id: The string id of the job to apply the operation to
         """
         self.operation = operation
         self.job_id = job_id
 
 
-@dataclass
 class Pagination:
-    """
-    Job pagination parameters.
+    """Job pagination parameters."""
+    __slots__ = ('skip', 'count', 'total')
 
-    :param skip: The number of jobs to skip
-    :param count: The number of jobs to return
-    :param total: The total number of jobs across all pages;
-                  used to calculate next and prev page links
-    """
-    skip: int
-    count: int
-    total: int = 0
+    def __init__(self, skip, count, total=0):
+        """
+        Create pagination parameters.
+
+        :param skip: The number of jobs to skip
+        :param count: The number of jobs to return
+        :param total: The total number of jobs across all pages;
+                      used to calculate next and prev page links
+        """
+        self.skip = skip
+        self.count = count
+        self.total = total
@@ -1,22 +1,68 @@
 """Built-in job data store implementations."""
-import collections
+import concurrent.futures
 import json
 import logging
 import os
 import posixpath
 import sqlite3
+import threading
+import weakref
 from datetime import datetime
 
 import boto3
+import boto3.dynamodb.types
 import botocore.exceptions
 import elasticsearch
 import elasticsearch.helpers
+import elasticsearch.serializer
 import yaml
 
 from . import env
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# NOTE: the stdlib fallback matches orjson's compact, key-sorted output
+# so encoded job data is identical whichever encoder is installed;
+# SQLite updates merge fields in place with json_set, which appends new
+# keys, so only whole documents written by the encoder are key-sorted
+try:
+    import orjson
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data):
+        return json.dumps(
+            data, ensure_ascii=False, sort_keys=True, separators=(',', ':')
+        ).encode()
+else:
+    _json_loads = orjson.loads
+
+    def _json_dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
 
 _logger = logging.getLogger(__name__)
+_ENV_FACTORIES = (
+    ('S3_BUCKET', lambda ev: S3Store(ev, prefix=env.get_var('S3_PREFIX'))),
+    ('DYNAMODB_TABLE', lambda ev: DynamoDBStore(ev)),
+    ('SQLITE_FILE', lambda ev: SQLiteStore(ev)),
+    ('ELASTICSEARCH_INDEX', lambda ev: ElasticsearchStore(ev, **{
+        'hosts': [
+            h.strip()
+            for h in env.get_var(
+                'ELASTICSEARCH_HOSTS', required=True
+            ).split(',')
+        ],
+    })),
+)
+_CONF_FACTORIES = (
+    ('elasticsearch', lambda kwargs: ElasticsearchStore(
+        kwargs['index'], **kwargs['client']
+    )),
+)
 
 
 def resolve():
@@ -25,34 +71,16 @@ def resolve():
 
     :returns: A data store implementation
     """
-    env_factories = {
-        'S3_BUCKET': lambda ev: S3Store(ev, prefix=env.get_var('S3_PREFIX')),
-        'DYNAMODB_TABLE': lambda ev: DynamoDBStore(ev),
-        'SQLITE_FILE': lambda ev: SQLiteStore(ev),
-        'ELASTICSEARCH_INDEX': lambda ev: ElasticsearchStore(ev, **{
-            'hosts': [
-                h.strip()
-                for h in env.get_var(
-                    'ELASTICSEARCH_HOSTS', required=True
-                ).split(',')
-            ],
-        }),
-    }
-    for env_var, factory in env_factories.items():
+    for env_var, factory in _ENV_FACTORIES:
         env_value = env.get_var(env_var)
         if env_value:
             return factory(env_value)
 
-    conf_factories = {
-        'elasticsearch': lambda kwargs: ElasticsearchStore(
-            kwargs['index'], **kwargs['client']
-        ),
-    }
     config_file = env.get_var('CONFIG_FILE')
     if config_file:
         with open(config_file) as f:
-            conf = yaml.safe_load(f)
-            for key, factory in conf_factories.items():
+            conf = yaml.load(f, Loader=_YamlLoader)
+            for key, factory in _CONF_FACTORIES:
                 kwargs = conf.get(key)
                 if kwargs:
                     return factory(kwargs)
@@ -89,18 +117,56 @@ class NullStore:
         pass
 
 
+class _SQLiteConnection(sqlite3.Connection):
+    # NOTE: the builtin connection type does not support weak references
+    pass
+
+
+def _store_sqlite_job_data(job_data):
+    return _json_dumps(job_data).decode()
+
+
+def _close_sqlite_connections(connections, lock):
+    with lock:
+        closing = list(connections)
+        connections.clear()
+    for conn in closing:
+        conn.close()
+
+
 class SQLiteStore:
     """SQLite data store."""
     _TABLE = 'jobs'
     _KEYCOL = 'id'
     _DATACOL = 'data'
     _DATATYPE = 'JSONTEXT'
+    _CREATE_TABLE_SQL = (
+        f"CREATE TABLE IF NOT EXISTS {_TABLE}("
+        f"{_KEYCOL} TEXT PRIMARY KEY NOT NULL,"
+        f" {_DATACOL} {_DATATYPE} NOT NULL)"
+    )
+    _SELECT_ALL_SQL = f"SELECT {_KEYCOL}, {_DATACOL} FROM {_TABLE}"
+    _INSERT_SQL = f"INSERT INTO {_TABLE} VALUES (?, ?)"
+    _UPDATE_SQL = (
+        f"UPDATE {_TABLE} SET {_DATACOL} = json_set({_DATACOL}, {{}})"
+        f" WHERE {_KEYCOL} = ?"
+    )
+    _DELETE_SQL = f"DELETE FROM {_TABLE} WHERE {_KEYCOL} = ?"
 
     def __init__(self, db_file):
         self._db_file = db_file
-        sqlite3.register_adapter(dict, self._store_job_data)
-        sqlite3.register_converter(self._DATATYPE, self._load_job_data)
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        sqlite3.register_adapter(dict, _store_sqlite_job_data)
+        sqlite3.register_converter(self._DATATYPE, _json_loads)
         self._ensure_table()
+        # NOTE: the finalizer runs at exit or when the store is collected,
+        # whichever comes first, without keeping the store alive
+        weakref.finalize(
+            self, _close_sqlite_connections,
+            self._connections, self._connections_lock
+        )
 
     def load_all(self):
         """
@@ -112,9 +178,7 @@ class SQLiteStore:
         with self._connection() as conn:
             yield from (
                 {'id': job_id, **job_data}
-                for job_id, job_data in conn.execute(
-                    f"SELECT * FROM {self._TABLE}"
-                )
+                for job_id, job_data in conn.execute(self._SELECT_ALL_SQL)
             )
 
     def create(self, job_id, job_data):
@@ -125,9 +189,7 @@ class SQLiteStore:
         :param job_data: Job row contents
         """
         with self._connection() as conn:
-            conn.execute(
-                f"INSERT INTO {self._TABLE} VALUES (?, ?)", (job_id, job_data)
-            )
+            conn.execute(self._INSERT_SQL, (job_id, job_data))
 
     def update(self, job_id, job_data):
         """
@@ -135,19 +197,25 @@ class SQLiteStore:
 
         :param job_id: Job row id
         :param job_data: Job row body
+        :raises: ValueError if a field name cannot be used as a JSON path
+        :raises: KeyError if no job row exists for job_id
         """
+        if not job_data:
+            return
+        # NOTE: merge the updated fields into the stored document in SQL
+        # rather than reading, decoding and re-encoding the whole row
+        paths = ', '.join('?, json(?)' for _ in job_data)
+        args = []
+        for key, value in job_data.items():
+            if '"' in key:
+                raise ValueError(f'Invalid job field name: {key}')
+            args += (f'$."{key}"', _json_dumps(value).decode())
         with self._connection() as conn:
-            cur = conn.execute(
-                f"SELECT * FROM {self._TABLE} WHERE {self._KEYCOL} = ?",
-                (job_id,)
-            )
-            current_data = cur.fetchone()[1]
-            current_data.update(job_data)
-            conn.execute(
-                f"UPDATE {self._TABLE} SET {self._DATACOL} = ?"
-                f" WHERE {self._KEYCOL} = ?",
-                (current_data, job_id)
+            cursor = conn.execute(
+                self._UPDATE_SQL.format(paths), (*args, job_id)
             )
+        if cursor.rowcount == 0:
+            raise KeyError(job_id)
 
     def delete(self, job_id):
         """
@@ -156,43 +224,53 @@ class SQLiteStore:
         :param job_id: Job row id
         """
         with self._connection() as conn:
-            conn.execute(
-                f"DELETE FROM {self._TABLE} WHERE {self._KEYCOL} = ?",
-                (job_id,)
-            )
+            conn.execute(self._DELETE_SQL, (job_id,))
+
+    def close(self):
+        """
+        Close all open database connections.
+
+        Later calls from any thread open a new connection.
+        """
+        self._local = threading.local()
+        _close_sqlite_connections(self._connections, self._connections_lock)
 
     def _connection(self):
-        return sqlite3.connect(
-            self._db_file,
-            isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
+        # NOTE: keep one connection per thread open for the life of the
+        # store instead of reconnecting and reconfiguring on every call;
+        # a connection is closed when its thread exits and releases it,
+        # any still open are closed by close() or the store's finalizer
+        try:
+            return self._local.conn
+        except AttributeError:
+            conn = sqlite3.connect(
+                self._db_file,
+                isolation_level=None,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                factory=_SQLiteConnection,
+                check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.add(conn)
+            return conn
 
     def _ensure_table(self):
         db_folder = os.path.dirname(self._db_file)
         if db_folder:
             os.makedirs(os.path.abspath(db_folder), exist_ok=True)
         with self._connection() as conn:
-            conn.execute(
-                "CREATE TABLE IF NOT EXISTS"
-                f" {self._TABLE}({self._KEYCOL} TEXT PRIMARY KEY NOT NULL,"
-                f" {self._DATACOL} {self._DATATYPE} NOT NULL)"
-            )
-
-    def _store_job_data(self, job_data):
-        return json.dumps(job_data, sort_keys=True)
-
-    def _load_job_data(self, job_bytes):
-        return json.loads(job_bytes)
+            conn.execute(self._CREATE_TABLE_SQL)
 
 
 class S3Store:
     """AWS S3 data store."""
-    _JobObject = collections.namedtuple(
-        'JobObject', ['summary', 'prefix', 'job_id', 'ext']
-    )
     _JOB_EXT = '.json'
-    _ENCODING = 'utf-8'
+    # NOTE: matches botocore's default max_pool_connections so concurrent
+    # GETs reuse pooled connections instead of opening throwaway ones
+    _LOAD_WORKERS = 10
 
     def __init__(self, bucket, prefix=None):
         """
@@ -204,6 +282,9 @@ class S3Store:
         self._s3 = boto3.resource('s3')
         self._bucket = self._s3.Bucket(bucket)
         self._prefix = prefix or ''
+        self._key_prefix = (
+            self._prefix[:-1] if self._prefix.endswith('/') else self._prefix
+        )
         self._ensure_bucket()
 
     def load_all(self):
@@ -217,11 +298,21 @@ class S3Store:
             msg += f', prefix {self._prefix}'
         msg += '...'
         _logger.info(msg)
-        job_objects = self._get_objects()
-        yield from (
-            {'id': jo.job_id, **self._load_obj_contents(jo.summary)}
-            for jo in job_objects
-        )
+        # NOTE: each job is a separate S3 GET so fetch them concurrently
+        # rather than paying one round-trip per job in sequence;
+        # boto3 resources are not thread-safe so workers use the client
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._LOAD_WORKERS
+        ) as executor:
+            loads = [
+                executor.submit(self._load_job, obj)
+                for obj in self._get_objects()
+            ]
+            try:
+                yield from (load.result() for load in loads)
+            finally:
+                for load in loads:
+                    load.cancel()
 
     def create(self, job_id, job_data):
         """
@@ -255,7 +346,7 @@ class S3Store:
         deleted_obj.delete()
 
     def _ensure_bucket(self):
-        s3_client = boto3.client('s3')
+        s3_client = self._s3.meta.client
         try:
             s3_client.head_bucket(Bucket=self._bucket.name)
         except botocore.exceptions.ClientError as ex:
@@ -264,7 +355,7 @@ class S3Store:
                     'S3 bucket not found; creating bucket "%s"',
                     self._bucket.name
                 )
-                current_region = boto3.session.Session().region_name
+                current_region = s3_client.meta.region_name
                 self._bucket.create(CreateBucketConfiguration={
                     'LocationConstraint': current_region,
                 })
@@ -274,25 +365,22 @@ class S3Store:
                 raise
 
     def _get_objects(self):
-        objects = self._bucket.objects.filter(Prefix=self._prefix)
-        job_objects = (self._make_job_object(o) for o in objects)
-        return (j for j in job_objects if self._valid_job(j))
-
-    def _make_job_object(self, s3_obj_summary):
-        prefix, name = posixpath.split(s3_obj_summary.key)
-        job_id, extension = posixpath.splitext(name)
-        return self._JobObject(s3_obj_summary, prefix, job_id, extension)
-
-    def _valid_job(self, job_object):
-        prefix_check = (
-            self._prefix[:-1]
-            if self._prefix and self._prefix[-1] == '/'
-            else self._prefix
-        )
-        return (
-            job_object.prefix == prefix_check
-            and job_object.ext == self._JOB_EXT
+        ext_len = len(self._JOB_EXT)
+        for obj in self._bucket.objects.filter(Prefix=self._prefix):
+            key_prefix, _, name = obj.key.rpartition('/')
+            if (
+                key_prefix == self._key_prefix
+                and len(name) > ext_len
+                and name.endswith(self._JOB_EXT)
+            ):
+                yield name[:-ext_len], obj.key
+
+    def _load_job(self, job_object):
+        job_id, key = job_object
+        response = self._s3.meta.client.get_object(
+            Bucket=self._bucket.name, Key=key
         )
+        return {'id': job_id, **_json_loads(response['Body'].read())}
 
     def _make_object(self, job_id):
         key = posixpath.join(self._prefix, job_id) + self._JOB_EXT
@@ -300,18 +388,18 @@ class S3Store:
 
     def _load_obj_contents(self, obj_handle):
         job_bytes = obj_handle.get()['Body'].read()
-        return json.loads(job_bytes)
+        return _json_loads(job_bytes)
 
     def _store_obj(self, obj_handle, data):
-        obj_handle.put(
-            Body=json.dumps(data, sort_keys=True).encode(self._ENCODING)
-        )
+        obj_handle.put(Body=_json_dumps(data))
 
 
 class DynamoDBStore:
     """DynamoDB data store."""
     _KEY_NAME = 'job-id'
     _DATA_NAME = 'json-data'
+    _SCAN_SEGMENTS = 4
+    _DESERIALIZER = boto3.dynamodb.types.TypeDeserializer()
 
     def __init__(self, table):
         """
@@ -331,22 +419,21 @@ class DynamoDBStore:
         _logger.info(
             'Loading jobs from DynamoDB table %s...', self._table.name
         )
-        batch = None
-        while True:
-            if batch:
-                if 'LastEvaluatedKey' in batch:
-                    batch = self._table.scan(
-                        ExclusiveStartKey=batch['LastEvaluatedKey']
-                    )
-                else:
-                    break
-            else:
-                batch = self._table.scan()
-            items = batch['Items']
-            yield from (
-                {'id': item[self._KEY_NAME], **self._parse_item(item)}
-                for item in items
+        # NOTE: scan disjoint table segments concurrently and only fetch
+        # the job attributes rather than paging through the whole table
+        # one item batch at a time; boto3 resources are not thread-safe
+        # so segments are scanned with the client
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._SCAN_SEGMENTS
+        ) as executor:
+            segments = executor.map(
+                self._scan_segment, range(self._SCAN_SEGMENTS)
             )
+            for items in segments:
+                yield from (
+                    {'id': item[self._KEY_NAME], **self._parse_item(item)}
+                    for item in items
+                )
 
     def create(self, job_id, job_data):
         """
@@ -378,7 +465,7 @@ class DynamoDBStore:
         self._table.delete_item(Key={self._KEY_NAME: job_id})
 
     def _ensure_table(self):
-        dyn_client = boto3.client('dynamodb')
+        dyn_client = self._table.meta.client
         try:
             dyn_client.describe_table(TableName=self._table.name)
         except dyn_client.exceptions.ResourceNotFoundException:
@@ -402,19 +489,53 @@ class DynamoDBStore:
             _logger.info('Waiting for table to exist...')
             self._table.wait_until_exists()
 
+    def _scan_segment(self, segment):
+        dyn_client = self._table.meta.client
+        scan_args = {
+            'TableName': self._table.name,
+            'Segment': segment,
+            'TotalSegments': self._SCAN_SEGMENTS,
+            'ProjectionExpression': '#k, #d',
+            'ExpressionAttributeNames': {
+                '#k': self._KEY_NAME,
+                '#d': self._DATA_NAME,
+            },
+        }
+        items = []
+        while True:
+            batch = dyn_client.scan(**scan_args)
+            items.extend(
+                {
+                    k: self._DESERIALIZER.deserialize(v)
+                    for k, v in item.items()
+                } for item in batch['Items']
+            )
+            if 'LastEvaluatedKey' not in batch:
+                return items
+            scan_args['ExclusiveStartKey'] = batch['LastEvaluatedKey']
+
     def _parse_item(self, item):
-        return json.loads(item[self._DATA_NAME])
+        return _json_loads(item[self._DATA_NAME])
 
     def _store_item(self, key, data):
         self._table.put_item(Item={
             self._KEY_NAME: key,
-            self._DATA_NAME: json.dumps(data, sort_keys=True),
+            self._DATA_NAME: _json_dumps(data).decode(),
         })
 
 
+class _ElasticsearchSerializer(elasticsearch.serializer.JSONSerializer):
+    def loads(self, s):
+        try:
+            return _json_loads(s)
+        except (ValueError, TypeError) as ex:
+            raise elasticsearch.exceptions.SerializationError(s, ex)
+
+
 class ElasticsearchStore:
     """Elasticsearch data store."""
     _SCROLL_PERIOD = '1m'
+    _SCROLL_SIZE = 5000
 
     def __init__(self, index, **client_args):
         """
@@ -423,6 +544,8 @@ class ElasticsearchStore:
         :param index: Name of the elasticsearch index to use
         :param **client_args: Arguments for the underlying elasticsearch client
         """
+        client_args.setdefault('serializer', _ElasticsearchSerializer())
+        client_args.setdefault('http_compress', True)
         self._es = elasticsearch.Elasticsearch(**client_args)
         self._index = index
         self._ensure_index()
@@ -437,7 +560,10 @@ class ElasticsearchStore:
             'Loading jobs from elasticsearch index %s...', self._index
         )
         hits = elasticsearch.helpers.scan(
-            client=self._es, index=self._index, scroll=self._SCROLL_PERIOD
+            client=self._es,
+            index=self._index,
+            scroll=self._SCROLL_PERIOD,
+            size=self._SCROLL_SIZE,
         )
         yield from ({'id': hit['_id'], **hit['_source']} for hit in hits)
 
@@ -1,16 +1,17 @@
 """Job execution classes."""
-import copy
 import logging
 from dataclasses import dataclass
 from typing import List, Dict
 
 import boto3
+import botocore.config
 
 from .. import env, triggers
 
 
 # see http://docs.aws.amazon.com/AmazonECS/latest/APIReference/API_RunTask.html
 _MAX_TASK_COUNT = 10
+_ECS_CONFIG = botocore.config.Config(retries={'mode': 'adaptive'})
 _logger = logging.getLogger(__name__)
 
 
@@ -33,9 +34,10 @@ class JobExecutor:
 
     def __init__(self):
         """Create an executor."""
-        self._ecs = boto3.client('ecs')
+        self._ecs = boto3.client('ecs', config=_ECS_CONFIG)
         self._cluster_name = env.get_var('ECS_CLUSTER', required=True)
         self._my_name = env.get_var('NAME', default='ecs-scheduler')
+        self._override_tags = {}
 
     def __call__(self, **job_data):
         """
@@ -51,7 +53,7 @@ class JobExecutor:
             desiredStatus='RUNNING'
         )
         running_task_count = self._calculate_running_count(
-            job_data, running_tasks['taskArns']
+            task_name, job_data, running_tasks['taskArns']
         )
         expected_task_count = self._calculate_expected_count(job_data)
         needed_task_count = max(0, expected_task_count - running_task_count)
@@ -72,26 +74,41 @@ class JobExecutor:
         )
         return JobResult(self.RETVAL_CHECKED_TASKS)
 
-    def _calculate_running_count(self, job_data, task_arns):
+    def _calculate_running_count(self, task_name, job_data, task_arns):
         if task_arns and 'overrides' in job_data:
-            tasks = self._ecs.describe_tasks(
-                cluster=self._cluster_name, tasks=task_arns
-            )
-            overridden_tasks = [
-                task for task in tasks['tasks']
-                if self._is_overridden_by_job(task, job_data['id'])
-            ]
-            return len(overridden_tasks)
+            task_tags = self._get_override_tags(task_name, task_arns)
+            job_id = job_data['id']
+            return sum(1 for arn in task_arns if task_tags.get(arn) == job_id)
         else:
             return len(task_arns)
 
-    def _is_overridden_by_job(self, task, job_id):
-        return any(
-            env.get('name') == self.OVERRIDE_TAG
-            and env.get('value') == job_id
+    def _get_override_tags(self, task_name, task_arns):
+        # NOTE: a task's overrides never change after launch so only
+        # describe tasks not seen on an earlier run; keep just the family's
+        # currently running tasks so stopped tasks fall out of the cache
+        known_tags = self._override_tags.get(task_name, {})
+        task_tags = {
+            arn: known_tags[arn] for arn in task_arns if arn in known_tags
+        }
+        new_arns = [arn for arn in task_arns if arn not in task_tags]
+        if new_arns:
+            tasks = self._ecs.describe_tasks(
+                cluster=self._cluster_name, tasks=new_arns
+            )
+            task_tags.update(
+                (task['taskArn'], self._get_override_tag(task))
+                for task in tasks['tasks']
+            )
+        self._override_tags[task_name] = task_tags
+        return task_tags
+
+    def _get_override_tag(self, task):
+        return next((
+            variable.get('value')
             for overrides in task['overrides']['containerOverrides']
-            for env in overrides.get('environment', [])
-        )
+            for variable in overrides.get('environment', [])
+            if variable.get('name') == self.OVERRIDE_TAG
+        ), None)
 
     def _calculate_expected_count(self, job_data):
         trigger_data = job_data.get('trigger', {})
@@ -126,19 +143,19 @@ class JobExecutor:
     def _add_overrides(self, run_kwargs, job_data):
         overrides = job_data.get('overrides')
         if overrides:
-            # APScheduler only gives me a shallow copy of kwargs on each job
-            # run so deep copy before manipulating
-            tagged_overrides = copy.deepcopy(overrides)
-            for override in tagged_overrides:
-                override['environment'][self.OVERRIDE_TAG] = job_data['id']
+            # NOTE: APScheduler only gives a shallow copy of kwargs on each
+            # job run so build new environments rather than tagging in place
             ecs_overrides = [
                 {
                     'name': override['containerName'],
                     'environment': [
                         {'name': k, 'value': v}
-                        for k, v in override['environment'].items()
+                        for k, v in {
+                            **override['environment'],
+                            self.OVERRIDE_TAG: job_data['id'],
+                        }.items()
                     ],
-                } for override in tagged_overrides
+                } for override in overrides
             ]
             run_kwargs['overrides'] = {'containerOverrides': ecs_overrides}
 
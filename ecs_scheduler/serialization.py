@@ -11,10 +11,11 @@ from .models import Pagination
 
 _MIN_TASKS = 1
 _MAX_TASKS = 50
+_TASK_DEFINITION_NAME = re.compile(r'[0-9A-Z_-]+$', re.I)
 
 
 def _validate_task_definition_name(value):
-    if not re.match(r'[0-9A-Z_-]+$', value, re.I):
+    if not _TASK_DEFINITION_NAME.match(value):
         raise marshmallow.ValidationError(
             'task definition names must contain only alphanumeric,'
             ' underscore, and hyphen'
@@ -72,6 +73,8 @@ class JobSchema(marshmallow.Schema):
     for an ECS task.
     """
     _WILD_CARD = '?'
+    # NOTE: wildcard value ranges for second, minute, and hour
+    _WILD_CARD_RANGES = (range(60), range(60), range(24))
 
     taskDefinition = marshmallow.fields.String(
         validate=_validate_task_definition_name
@@ -138,29 +141,18 @@ class JobSchema(marshmallow.Schema):
             'month',
             'year',
         ]
+        wildcards = [
+            i for i, part in enumerate(schedule_parts[:3])
+            if part == self._WILD_CARD
+        ]
+        for i in wildcards:
+            schedule_parts[i] = str(random.choice(self._WILD_CARD_RANGES[i]))
         schedule_args = dict(zip(params, schedule_parts))
         day = schedule_args.get('day')
         if day:
             schedule_args['day'] = day.replace('_', ' ')
-        return self._process_wildcards(
-            zip(params[:3], [range(60), range(60), range(24)]),
-            value,
-            schedule_args
-        )
-
-    def _process_wildcards(
-        self, wc_params, schedule_expression, schedule_args
-    ):
-        for wc_param in wc_params:
-            k = wc_param[0]
-            value = schedule_args.get(k)
-            if value == self._WILD_CARD:
-                new_value = str(random.choice(wc_param[1]))
-                schedule_args[k] = new_value
-                schedule_expression = schedule_expression.replace(
-                    self._WILD_CARD, new_value, 1
-                )
-        return schedule_expression, schedule_args
+        expression = ' '.join(schedule_parts) if wildcards else value
+        return expression, schedule_args
 
 
 class JobCreateSchema(JobSchema):
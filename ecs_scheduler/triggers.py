@@ -2,8 +2,10 @@
 import math
 
 import boto3
+import botocore.config
 
 
+_SQS_CONFIG = botocore.config.Config(retries={'mode': 'adaptive'})
 _triggers = {}
 
 
@@ -44,7 +46,8 @@ class SqsTrigger:
 
     def __init__(self):
         """Create a trigger."""
-        self._sqs = boto3.resource('sqs')
+        self._sqs = boto3.resource('sqs', config=_SQS_CONFIG)
+        self._queue_urls = {}
 
     def determine_task_count(self, job_data):
         """
@@ -56,14 +59,30 @@ class SqsTrigger:
                   definition; at a minimum will return the task count
                   of the job
         """
-        queue = self._sqs.get_queue_by_name(
-            QueueName=job_data['trigger']['queueName']
+        queue_url = self._get_queue_url(job_data['trigger']['queueName'])
+        response = self._sqs.meta.client.get_queue_attributes(
+            QueueUrl=queue_url, AttributeNames=['ApproximateNumberOfMessages']
+        )
+        message_count = int(
+            response['Attributes']['ApproximateNumberOfMessages']
         )
-        message_count = int(queue.attributes['ApproximateNumberOfMessages'])
         if message_count > 0:
             return self._calculate_task_count(message_count, job_data)
         return 0
 
+    def _get_queue_url(self, queue_name):
+        # NOTE: queue urls are fixed for the lifetime of a queue
+        # so only look them up once
+        try:
+            return self._queue_urls[queue_name]
+        except KeyError:
+            response = self._sqs.meta.client.get_queue_url(
+                QueueName=queue_name
+            )
+            return self._queue_urls.setdefault(
+                queue_name, response['QueueUrl']
+            )
+
     def _calculate_task_count(self, message_count, job_data):
         scaling_factor = job_data['trigger'].get('messagesPerTask')
         scaled_task_count = (
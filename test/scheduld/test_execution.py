@@ -9,7 +9,7 @@ from ecs_scheduler.scheduld.execution import JobExecutor, JobResult
 @patch('ecs_scheduler.scheduld.execution.triggers.get')
 class JobExecutorTests(unittest.TestCase):
     def setUp(self):
-        with patch('boto3.client'), \
+        with patch('boto3.client') as self._client, \
             patch.dict(
                 os.environ,
                 {
@@ -20,6 +20,11 @@ class JobExecutorTests(unittest.TestCase):
         ):
             self._exec = JobExecutor()
 
+    def test_init_uses_adaptive_retries(self, fake_get_trigger):
+        self._client.assert_called_with('ecs', config=unittest.mock.ANY)
+        config = self._client.call_args.kwargs['config']
+        self.assertEqual('adaptive', config.retries['mode'])
+
     def test_call_does_nothing_if_zero_task_count(self, fake_get_trigger):
         fake_trigger = Mock()
         fake_trigger.determine_task_count.return_value = 0
@@ -344,6 +349,9 @@ class JobExecutorTests(unittest.TestCase):
             expected_overrides,
             self._exec._ecs.run_task.call_args[1]['overrides']
         )
+        self.assertEqual(
+            {'foo': 'bar', 'baz': 'bort'}, job_overrides[0]['environment']
+        )
         fake_get_trigger.assert_called_with(None)
 
     def test_call_checks_override_tags_for_running_count(
@@ -358,31 +366,31 @@ class JobExecutorTests(unittest.TestCase):
         self._exec._ecs.run_task.return_value = {'tasks': [], 'failures': []}
         self._exec._ecs.describe_tasks.return_value = {
             'tasks': [
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'a', 'overrides': {'containerOverrides': [
                     {'name': 'a'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'b', 'overrides': {'containerOverrides': [
                     {'name': 'b', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'c', 'overrides': {'containerOverrides': [
                     {'name': 'c'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'd', 'overrides': {'containerOverrides': [
                     {'name': 'd', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'e', 'overrides': {'containerOverrides': [
                     {'name': 'e', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'f', 'overrides': {'containerOverrides': [
                     {'name': 'f'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'g', 'overrides': {'containerOverrides': [
                     {'name': 'g'},
                 ]}},
             ],
@@ -428,31 +436,31 @@ class JobExecutorTests(unittest.TestCase):
         self._exec._ecs.run_task.return_value = {'tasks': [], 'failures': []}
         self._exec._ecs.describe_tasks.return_value = {
             'tasks': [
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'a', 'overrides': {'containerOverrides': [
                     {'name': 'a'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'b', 'overrides': {'containerOverrides': [
                     {'name': 'b', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                         {'name': 'bar', 'value': 'baz'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'c', 'overrides': {'containerOverrides': [
                     {'name': 'c'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'd', 'overrides': {'containerOverrides': [
                     {'name': 'd'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'e', 'overrides': {'containerOverrides': [
                     {'name': 'e', 'environment': [
                         {'name': 'bort', 'value': 'bart'},
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'f', 'overrides': {'containerOverrides': [
                     {'name': 'f'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'g', 'overrides': {'containerOverrides': [
                     {'name': 'g'},
                 ]}},
             ],
@@ -499,10 +507,10 @@ class JobExecutorTests(unittest.TestCase):
         self._exec._ecs.run_task.return_value = {'tasks': [], 'failures': []}
         self._exec._ecs.describe_tasks.return_value = {
             'tasks': [
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'a', 'overrides': {'containerOverrides': [
                     {'name': 'a'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'b', 'overrides': {'containerOverrides': [
                     {'name': 'b', 'environment': [
                         {'name': 'bort', 'value': 'blarg'},
                     ]},
@@ -510,16 +518,16 @@ class JobExecutorTests(unittest.TestCase):
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'c', 'overrides': {'containerOverrides': [
                     {'name': 'c'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'd', 'overrides': {'containerOverrides': [
                     {'name': 'd'},
                     {'name': 'd-2', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'e', 'overrides': {'containerOverrides': [
                     {'name': 'e', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'job-id'},
                     ]},
@@ -527,7 +535,7 @@ class JobExecutorTests(unittest.TestCase):
                         {'name': 'baz', 'value': 'bort'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'f', 'overrides': {'containerOverrides': [
                     {'name': 'f', 'environment': [
                         {'name': 'foo', 'value': 'bar'},
                     ]},
@@ -538,7 +546,7 @@ class JobExecutorTests(unittest.TestCase):
                         {'name': 'baz', 'value': 'bort'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'g', 'overrides': {'containerOverrides': [
                     {'name': 'g'},
                 ]}},
             ],
@@ -584,18 +592,18 @@ class JobExecutorTests(unittest.TestCase):
         self._exec._ecs.run_task.return_value = {'tasks': [], 'failures': []}
         self._exec._ecs.describe_tasks.return_value = {
             'tasks': [
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'a', 'overrides': {'containerOverrides': [
                     {'name': 'a'}
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'b', 'overrides': {'containerOverrides': [
                     {'name': 'b', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'notme'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'c', 'overrides': {'containerOverrides': [
                     {'name': 'c'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'd', 'overrides': {'containerOverrides': [
                     {'name': 'd', 'environment': [
                         {
                             'name': self._exec.OVERRIDE_TAG,
@@ -603,15 +611,15 @@ class JobExecutorTests(unittest.TestCase):
                         },
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'e', 'overrides': {'containerOverrides': [
                     {'name': 'e', 'environment': [
                         {'name': self._exec.OVERRIDE_TAG, 'value': 'boobar'},
                     ]},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'f', 'overrides': {'containerOverrides': [
                     {'name': 'f'},
                 ]}},
-                {'overrides': {'containerOverrides': [
+                {'taskArn': 'g', 'overrides': {'containerOverrides': [
                     {'name': 'g'},
                 ]}}
             ],
@@ -646,6 +654,53 @@ class JobExecutorTests(unittest.TestCase):
         )
         fake_get_trigger.assert_called_with(None)
 
+    def test_call_only_describes_new_override_tasks(self, fake_get_trigger):
+        fake_trigger = Mock()
+        fake_trigger.determine_task_count.return_value = 2
+        fake_get_trigger.return_value = fake_trigger
+        tag = self._exec.OVERRIDE_TAG
+        self._exec._ecs.list_tasks.side_effect = [
+            {'taskArns': ['a', 'b']},
+            {'taskArns': ['b', 'c']},
+        ]
+        self._exec._ecs.describe_tasks.side_effect = [
+            {'tasks': [
+                {'taskArn': 'a', 'overrides': {'containerOverrides': [
+                    {'name': 'a', 'environment': [
+                        {'name': tag, 'value': 'job-id'},
+                    ]},
+                ]}},
+                {'taskArn': 'b', 'overrides': {'containerOverrides': [
+                    {'name': 'b', 'environment': [
+                        {'name': tag, 'value': 'job-id'},
+                    ]},
+                ]}},
+            ]},
+            {'tasks': [
+                {'taskArn': 'c', 'overrides': {'containerOverrides': [
+                    {'name': 'c', 'environment': [
+                        {'name': tag, 'value': 'job-id'},
+                    ]},
+                ]}},
+            ]},
+        ]
+        job_overrides = [{
+            'containerName': 'test-container',
+            'environment': {'foo': 'bar'},
+        }]
+
+        first = self._exec(id='job-id', overrides=job_overrides)
+        second = self._exec(id='job-id', overrides=job_overrides)
+
+        self.assertEqual(JobExecutor.RETVAL_CHECKED_TASKS, first.return_code)
+        self.assertEqual(JobExecutor.RETVAL_CHECKED_TASKS, second.return_code)
+        self._exec._ecs.describe_tasks.assert_called_with(
+            cluster='testCluster', tasks=['c']
+        )
+        self.assertEqual(
+            {'b', 'c'}, self._exec._override_tags['job-id'].keys()
+        )
+
     def test_call_uses_task_description_instead_of_id_if_present(
         self, fake_get_trigger
     ):
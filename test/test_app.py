@@ -70,7 +70,7 @@ class CreateTests(unittest.TestCase):
 
         result = create()
 
-        env.init.assert_called_with()
+        env.init.assert_not_called()
         queue_class.assert_not_called()
         datacontext.load.assert_not_called()
         create_scheduld.assert_not_called()
@@ -84,6 +84,7 @@ class CreateTests(unittest.TestCase):
         self, fake_log, env, queue_class, datacontext, webapi, create_scheduld,
         reloader, exit_register
     ):
+        reloader.return_value = True
         env.init.side_effect = RuntimeError
 
         with self.assertRaises(RuntimeError):
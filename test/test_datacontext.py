@@ -1,8 +1,9 @@
+import threading
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, call
 
 from ecs_scheduler.datacontext import (
-    Jobs, Job, JobDataMapping, JobNotFound, InvalidJobData, JobAlreadyExists,
+    Jobs, Job, JobNotFound, InvalidJobData, JobAlreadyExists,
     JobPersistenceError, JobFieldsRequirePersistence, ImmutableJobFields
 )
 
@@ -11,10 +12,10 @@ class JobsTests(unittest.TestCase):
     def setUp(self):
         self._store = Mock()
         self._store.load_all.return_value = {'id': 1}, {'id': 2}
-        with patch('ecs_scheduler.datacontext.JobCreateSchema') as sp, \
-                patch('ecs_scheduler.datacontext.RLock') as rp:
-            self._schema = sp.return_value
-            self._schema.load.side_effect = lambda d: (d, {})
+        with patch('ecs_scheduler.datacontext._job_create_schema') as sp, \
+                patch('ecs_scheduler.datacontext.Lock') as rp:
+            self._schema = sp
+            self._schema.load.side_effect = lambda d, many=False: (d, {})
             self._schema.dump.side_effect = \
                 lambda d: Mock(data={'validated': True, **d})
             self._lock = rp.return_value
@@ -28,32 +29,59 @@ class JobsTests(unittest.TestCase):
         persistence.resolve.assert_called()
         persistence.resolve.return_value.load_all.assert_called_with()
 
+    def test_load_deserializes_all_jobs_at_once(self):
+        self._schema.load.assert_called_once_with(
+            [{'id': 1}, {'id': 2}], many=True
+        )
+
+    def test_load_raises_if_invalid_data(self):
+        self._schema.load.side_effect = lambda d, many=False: (
+            d, {1: {'error': 'bad'}, 0: {'error': 'worse'}}
+        )
+
+        with patch(
+            'ecs_scheduler.datacontext._job_create_schema', self._schema
+        ), self.assertRaises(InvalidJobData) as cm:
+            Jobs.load(self._store)
+
+        self.assertEqual(1, cm.exception.job_id)
+        self.assertEqual({'error': 'worse'}, cm.exception.errors)
+
     def test_get_all_returns_all(self):
         self._store.load_all.assert_called_with()
         self.assertCountEqual([1, 2], [j.id for j in self._target.get_all()])
-        self._lock.__enter__.assert_called()
-        self._lock.__exit__.assert_called()
+        self._lock.__enter__.assert_not_called()
+
+    def test_get_all_iterates_snapshot(self):
+        jobs = self._target.get_all()
+        first = next(jobs)
+
+        self._target.create({'id': 4})
+        self._target.delete(first.id)
+
+        self.assertEqual(1, len(list(jobs)))
+        self.assertCountEqual(
+            [2, 4] if first.id == 1 else [1, 4],
+            [j.id for j in self._target.get_all()]
+        )
 
     def test_len_gets_jobs_length(self):
         self.assertEqual(2, self._target.total())
-        self._lock.__enter__.assert_called()
-        self._lock.__exit__.assert_called()
+        self._lock.__enter__.assert_not_called()
 
     def test_get_retrieves_job(self):
         result = self._target.get(2)
 
         self.assertIsInstance(result, Job)
         self.assertEqual(2, result.id)
-        self._lock.__enter__.assert_called()
-        self._lock.__exit__.assert_called()
+        self._lock.__enter__.assert_not_called()
 
     def test_get_raises_error(self):
         with self.assertRaises(JobNotFound) as cm:
             self._target.get(3)
 
         self.assertEqual(3, cm.exception.job_id)
-        self._lock.__enter__.assert_called()
-        self._lock.__exit__.assert_called()
+        self._lock.__enter__.assert_not_called()
 
     def test_create_new_job(self):
         data = {'id': 4, 'foo': 'bar'}
@@ -68,6 +96,14 @@ class JobsTests(unittest.TestCase):
         self._lock.__enter__.assert_called()
         self._lock.__exit__.assert_called()
 
+    def test_create_job_has_own_lock(self):
+        result = self._target.create({'id': 4, 'foo': 'bar'})
+        self._lock.reset_mock()
+
+        result.annotate({'baz': 'bort'})
+
+        self._lock.__enter__.assert_not_called()
+
     def test_create_raises_if_invalid_data(self):
         self._schema.load.side_effect = lambda d: (d, {'error': 'bad'})
         data = {'id': 4, 'foo': 'bar'}
@@ -157,9 +193,9 @@ class JobTests(unittest.TestCase):
     def setUp(self):
         self._store = Mock()
         self._job_data = {'id': 32, 'foo': 'bar'}
-        with patch('ecs_scheduler.datacontext.JobSchema') as sp, \
-                patch('ecs_scheduler.datacontext.RLock') as rp:
-            self._schema = sp.return_value
+        with patch('ecs_scheduler.datacontext._job_schema') as sp, \
+                patch('ecs_scheduler.datacontext.Lock') as rp:
+            self._schema = sp
             self._lock = rp.return_value
             self._target = Job(self._job_data, self._store)
         self._schema.load.side_effect = lambda d: (d, {})
@@ -173,6 +209,10 @@ class JobTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             self._target.data['baz'] = 'bort'
 
+    def test_data_cannot_be_replaced(self):
+        with self.assertRaises(AttributeError):
+            self._target.data = {'baz': 'bort'}
+
     def test_id_property_returns_id(self):
         self.assertEqual(32, self._target.id)
 
@@ -180,14 +220,22 @@ class JobTests(unittest.TestCase):
         self.assertFalse(self._target.suspended)
 
     def test_suspended_property_field(self):
-        self._job_data['suspended'] = True
+        target = Job(
+            {'id': 32, 'suspended': True}, self._store
+        )
 
-        self.assertTrue(self._target.suspended)
+        self.assertTrue(target.suspended)
+
+    def test_parsed_schedule_missing(self):
+        with self.assertRaises(KeyError):
+            self._target.parsed_schedule
 
     def test_parsed_schedule_field(self):
-        self._job_data['parsedSchedule'] = 'parsed'
+        target = Job(
+            {'id': 32, 'parsedSchedule': 'parsed'}, self._store
+        )
 
-        self.assertEqual('parsed', self._target.parsed_schedule)
+        self.assertEqual('parsed', target.parsed_schedule)
 
     def test_update(self):
         new_data = {'a': 1, 'b': 2}
@@ -202,6 +250,14 @@ class JobTests(unittest.TestCase):
         self._lock.__enter__.assert_called()
         self._lock.__exit__.assert_called()
 
+    def test_update_refreshes_cached_fields(self):
+        new_data = {'suspended': True, 'parsedSchedule': 'parsed'}
+
+        self._target.update(new_data)
+
+        self.assertTrue(self._target.suspended)
+        self.assertEqual('parsed', self._target.parsed_schedule)
+
     def test_update_changes_existing_fields(self):
         new_data = {'a': 1, 'foo': 'baz'}
 
@@ -216,7 +272,9 @@ class JobTests(unittest.TestCase):
         self._lock.__exit__.assert_called()
 
     def test_update_does_not_allow_id_override(self):
-        job_with_real_schema = Job({'id': 44, 'foo': 'bar'}, self._store)
+        job_with_real_schema = Job(
+            {'id': 44, 'foo': 'bar'}, self._store
+        )
         new_data = {'id': 77, 'taskCount': 4}
 
         job_with_real_schema.update(new_data)
@@ -236,8 +294,7 @@ class JobTests(unittest.TestCase):
         self.assertNotIn('a', self._target.data)
         self.assertNotIn('b', self._target.data)
         self._store.update.assert_not_called()
-        self._lock.__enter__.assert_called()
-        self._lock.__exit__.assert_called()
+        self._lock.__enter__.assert_not_called()
 
     def test_update_raises_if_store_error(self):
         self._store.update.side_effect = RuntimeError
@@ -255,6 +312,64 @@ class JobTests(unittest.TestCase):
         self._lock.__enter__.assert_called()
         self._lock.__exit__.assert_called()
 
+    def test_update_does_not_block_other_jobs_on_store(self):
+        store_entered, release_store = threading.Event(), threading.Event()
+
+        def blocking_update(job_id, data):
+            store_entered.set()
+            release_store.wait(5)
+        self._store.update.side_effect = blocking_update
+        updating_job = Job({'id': 32}, self._store)
+        other_job = Job({'id': 44}, self._store)
+        updater = threading.Thread(
+            target=updating_job.update, args=({'a': 1},)
+        )
+        updater.start()
+        try:
+            self.assertTrue(store_entered.wait(5))
+            annotator = threading.Thread(
+                target=other_job.annotate, args=({'b': 2},)
+            )
+            annotator.start()
+            annotator.join(1)
+
+            self.assertFalse(annotator.is_alive())
+            self.assertEqual(2, other_job.data['b'])
+        finally:
+            release_store.set()
+            updater.join()
+
+    def test_concurrent_updates_keep_store_order(self):
+        store_entered, release_store = threading.Event(), threading.Event()
+
+        def blocking_update(job_id, data):
+            if data['a'] == 1:
+                store_entered.set()
+                release_store.wait(5)
+        self._store.update.side_effect = blocking_update
+        with patch('ecs_scheduler.datacontext._job_schema', self._schema):
+            target = Job({'id': 32}, self._store)
+        first = threading.Thread(target=target.update, args=({'a': 1},))
+        second = threading.Thread(target=target.update, args=({'a': 2},))
+        first.start()
+        try:
+            self.assertTrue(store_entered.wait(5))
+            second.start()
+            second.join(0.1)
+
+            self.assertTrue(second.is_alive())
+            self.assertEqual(1, self._store.update.call_count)
+        finally:
+            release_store.set()
+            first.join()
+            second.join()
+
+        self._store.update.assert_has_calls([
+            call(32, {'validated': True, 'a': 1}),
+            call(32, {'validated': True, 'a': 2}),
+        ])
+        self.assertEqual(2, target.data['a'])
+
     def test_annotate(self):
         self._schema.load.side_effect = lambda d: ({}, {})
         new_data = {'a': 1, 'b': 2}
@@ -268,7 +383,9 @@ class JobTests(unittest.TestCase):
         self._lock.__exit__.assert_called()
 
     def test_annotate_does_not_allow_id_override(self):
-        job_with_real_schema = Job({'id': 44, 'foo': 'bar'}, self._store)
+        job_with_real_schema = Job(
+            {'id': 44, 'foo': 'bar'}, self._store
+        )
         new_data = {'id': 77, 'b': 2}
 
         with self.assertRaises(ImmutableJobFields) as cm:
@@ -280,7 +397,9 @@ class JobTests(unittest.TestCase):
         self._store.update.assert_not_called()
 
     def test_annotate_does_not_allow_setting_persistent_fields(self):
-        job_with_real_schema = Job({'id': 44, 'foo': 'bar'}, self._store)
+        job_with_real_schema = Job(
+            {'id': 44, 'foo': 'bar'}, self._store
+        )
         new_data = {'taskCount': 4, 'schedule': '* *', 'b': 2}
 
         with self.assertRaises(JobFieldsRequirePersistence) as cm:
@@ -295,24 +414,3 @@ class JobTests(unittest.TestCase):
         self.assertNotIn('b', job_with_real_schema.data)
         self._store.update.assert_not_called()
 
-
-class JobDataMappingTests(unittest.TestCase):
-    def setUp(self):
-        self._data = {'a': 1, 'b': 2}
-        self._target = JobDataMapping(self._data)
-
-    def test_get(self):
-        self.assertEqual(self._data['a'], self._target['a'])
-
-    def test_set_unsupported(self):
-        with self.assertRaises(TypeError):
-            self._target['c'] = 3
-
-    def test_iterate(self):
-        expected = list(iter(self._data))
-        actual = list(iter(self._target))
-
-        self.assertCountEqual(expected, actual)
-
-    def test_length(self):
-        self.assertEqual(len(self._data), len(self._target))
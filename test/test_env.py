@@ -8,46 +8,69 @@ from ecs_scheduler import env, __version__
 
 @patch('ecs_scheduler.env.triggers')
 class InitTests(unittest.TestCase):
-    @patch.object(logging, 'basicConfig')
+    def setUp(self):
+        self._root = logging.RootLogger(logging.WARNING)
+        root_patch = patch.object(logging, 'root', self._root)
+        root_patch.start()
+        self.addCleanup(root_patch.stop)
+        flags_patch = patch.multiple(
+            logging, logThreads=True, logProcesses=True,
+            logMultiprocessing=True
+        )
+        flags_patch.start()
+        self.addCleanup(flags_patch.stop)
+
     @patch.dict('os.environ', clear=True)
-    def test(self, fake_log, triggers):
+    def test(self, triggers):
         env.init()
 
         triggers.init.assert_called_with()
 
-    @patch.object(logging, 'basicConfig')
     @patch.dict('os.environ', clear=True)
-    def test_with_no_predefined_vars(self, fake_log, triggers):
+    def test_with_no_predefined_vars(self, triggers):
         env.init()
 
-        fake_log.assert_called_with(
-            level=None,
-            handlers=unittest.mock.ANY,
-            format='%(levelname)s:%(name)s:%(asctime)s %(message)s'
+        self.assertEqual(logging.WARNING, self._root.level)
+        self.assertEqual(1, len(self._root.handlers))
+        handler = self._root.handlers[0]
+        self.assertIsInstance(handler, logging.StreamHandler)
+        self.assertEqual(
+            '%(levelname)s:%(name)s:%(asctime)s %(message)s',
+            handler.formatter._fmt
         )
-        pos_args, expected_args = fake_log.call_args
-        expected_handlers = expected_args['handlers']
-        self.assertEqual(1, len(expected_handlers))
-        self.assertIsInstance(expected_handlers[0], logging.StreamHandler)
 
-    @patch.object(logging, 'basicConfig')
     @patch.dict('os.environ', {'ECSS_LOG_LEVEL': 'INFO'})
-    def test_sets_loglevel_if_specified(self, fake_log, triggers):
+    def test_sets_loglevel_if_specified(self, triggers):
         env.init()
 
-        fake_log.assert_called_with(
-            level=logging.INFO,
-            handlers=unittest.mock.ANY,
-            format='%(levelname)s:%(name)s:%(asctime)s %(message)s'
-        )
+        self.assertEqual(logging.INFO, self._root.level)
+
+    @patch.dict('os.environ', clear=True)
+    def test_disables_unused_record_info(self, triggers):
+        env.init()
+
+        self.assertFalse(logging.logThreads)
+        self.assertFalse(logging.logProcesses)
+        self.assertFalse(logging.logMultiprocessing)
+
+    @patch.dict('os.environ', {'ECSS_LOG_LEVEL': 'INFO'})
+    def test_skips_logging_if_already_configured(self, triggers):
+        existing_handler = logging.NullHandler()
+        self._root.addHandler(existing_handler)
+
+        env.init()
+
+        self.assertEqual([existing_handler], self._root.handlers)
+        self.assertEqual(logging.WARNING, self._root.level)
+        self.assertTrue(logging.logThreads)
+        triggers.init.assert_called_with()
 
-    @patch.object(logging, 'basicConfig')
     @patch('os.path.abspath', side_effect=lambda p: '/abs/path/' + p)
     @patch('os.makedirs')
     @patch.dict(
         'os.environ', {'ECSS_LOG_FOLDER': 'foo/bar/testlog'}, clear=True
     )
-    def test_sets_logfile(self, fake_makedirs, abspath, fake_log, triggers):
+    def test_sets_logfile(self, fake_makedirs, abspath, triggers):
         with patch.object(
             logging.handlers, 'RotatingFileHandler',
             spec=logging.handlers.RotatingFileHandler
@@ -60,13 +83,12 @@ class InitTests(unittest.TestCase):
                 'foo/bar/testlog/app.log', maxBytes=5*1024*1024, backupCount=1
             )
 
-        pos_args, expected_args = fake_log.call_args
-        expected_handlers = expected_args['handlers']
-        self.assertEqual(2, len(expected_handlers))
-        self.assertIsInstance(expected_handlers[1],
-                              logging.handlers.RotatingFileHandler)
+        self.assertEqual(2, len(self._root.handlers))
+        self.assertIs(fake_file_handler.return_value, self._root.handlers[1])
+        fake_file_handler.return_value.setFormatter.assert_called_with(
+            self._root.handlers[0].formatter
+        )
 
-    @patch.object(logging, 'basicConfig')
     @patch('os.path.abspath', side_effect=lambda p: '/abs/path/' + p)
     @patch('os.makedirs')
     @patch.dict(
@@ -78,7 +100,7 @@ class InitTests(unittest.TestCase):
         clear=True
     )
     def test_sets_logfile_with_env_vars(
-        self, fake_makedirs, abspath, fake_log, triggers
+        self, fake_makedirs, abspath, triggers
     ):
         with patch.object(
             logging.handlers, 'RotatingFileHandler',
@@ -94,12 +116,8 @@ class InitTests(unittest.TestCase):
                 backupCount=1
             )
 
-        pos_args, expected_args = fake_log.call_args
-        expected_handlers = expected_args['handlers']
-        self.assertEqual(2, len(expected_handlers))
-        self.assertIsInstance(
-            expected_handlers[1], logging.handlers.RotatingFileHandler
-        )
+        self.assertEqual(2, len(self._root.handlers))
+        self.assertIs(fake_file_handler.return_value, self._root.handlers[1])
 
 
 class GetVarTests(unittest.TestCase):
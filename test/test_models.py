@@ -1,6 +1,6 @@
 import unittest
 
-from ecs_scheduler.models import Pagination, JobOperation
+from ecs_scheduler.models import Pagination, JobOperation, OperationType
 
 
 class JobOperationTests(unittest.TestCase):
@@ -37,6 +37,17 @@ class JobOperationTests(unittest.TestCase):
         self.assertEqual(JobOperation.REMOVE, op.operation)
         self.assertIs(job_id, op.job_id)
 
+    def test_labels_are_operation_types(self):
+        self.assertIs(OperationType.ADD, JobOperation.ADD)
+        self.assertIs(OperationType.MODIFY, JobOperation.MODIFY)
+        self.assertIs(OperationType.REMOVE, JobOperation.REMOVE)
+
+    def test_does_not_allow_extra_attributes(self):
+        op = JobOperation.add('foo')
+
+        with self.assertRaises(AttributeError):
+            op.extra = 'bar'
+
 
 class PaginationTests(unittest.TestCase):
     def test_ctor_sets_attributes(self):
@@ -52,3 +63,9 @@ class PaginationTests(unittest.TestCase):
         self.assertEqual(33, page.skip)
         self.assertEqual(44, page.count)
         self.assertEqual(55, page.total)
+
+    def test_does_not_allow_extra_attributes(self):
+        page = Pagination(12, 42)
+
+        with self.assertRaises(AttributeError):
+            page.extra = 'bar'
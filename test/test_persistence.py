@@ -1,10 +1,13 @@
+import gc
 import logging
 import os
 import sqlite3
+import threading
 import unittest
+import weakref
 from datetime import datetime
 from io import BytesIO
-from unittest.mock import patch, Mock, call, ANY
+from unittest.mock import patch, Mock, MagicMock, call, ANY
 
 import boto3
 import botocore.exceptions
@@ -100,7 +103,7 @@ class ResolveTests(unittest.TestCase):
         os.environ, {'ECSS_CONFIG_FILE': '/etc/opt/test.yaml'}, clear=True
     )
     def test_resolve_elasticsearch_extended(self, elasticsearch, yaml, f_open):
-        yaml.safe_load.return_value = {
+        yaml.load.return_value = {
             'elasticsearch': {
                 'index': 'test-index', 'client': {'foo': 'bar', 'a': 1},
             },
@@ -110,6 +113,9 @@ class ResolveTests(unittest.TestCase):
 
         self.assertIs(elasticsearch.return_value, result)
         f_open.assert_called_with('/etc/opt/test.yaml')
+        yaml.load.assert_called_with(
+            f_open.return_value.__enter__.return_value, Loader=ANY
+        )
         elasticsearch.assert_called_with('test-index', foo='bar', a=1)
 
 
@@ -152,6 +158,13 @@ class SQLiteStoreTests(unittest.TestCase):
         self._adapt.assert_called_with(dict, ANY)
         self._conv.assert_called_with('JSONTEXT', ANY)
 
+    def test_adapter_writes_compact_unescaped_json(self):
+        adapter = self._adapt.call_args[0][1]
+
+        result = adapter({'b': 'café', 'a': [1, 2]})
+
+        self.assertEqual('{"a":[1,2],"b":"café"}', result)
+
     def test_init_creates_file_folder_if_present(self):
         with patch('sqlite3.register_adapter'), \
             patch('sqlite3.register_converter'), \
@@ -166,7 +179,9 @@ class SQLiteStoreTests(unittest.TestCase):
         self._connect.assert_called_with(
             'test-file',
             isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            factory=ANY,
+            check_same_thread=False
         )
         args = self._conn.execute.call_args[0]
         self.assertEqual(1, self._connect.call_count)
@@ -177,19 +192,75 @@ class SQLiteStoreTests(unittest.TestCase):
         self._mkdirs.assert_not_called()
         self._abspath.assert_not_called()
 
+    def test_init_configures_connection(self):
+        self._connect.return_value.execute.assert_has_calls([
+            call('PRAGMA journal_mode=WAL'),
+            call('PRAGMA synchronous=NORMAL'),
+        ])
+
+    def test_connection_is_per_thread(self):
+        thread = threading.Thread(target=self._target.delete, args=('foo',))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(2, self._connect.call_count)
+
+    def test_close_closes_connections(self):
+        self._target.close()
+
+        self._connect.return_value.close.assert_called_once_with()
+
+    def test_close_closes_connections_from_other_threads(self):
+        thread_conn = MagicMock()
+        self._connect.side_effect = [thread_conn]
+        thread = threading.Thread(target=self._target.delete, args=('foo',))
+        thread.start()
+        thread.join()
+
+        self._target.close()
+
+        thread_conn.__enter__.return_value.execute.assert_called_once_with(
+            'DELETE FROM jobs WHERE id = ?', ('foo',)
+        )
+        self._connect.return_value.close.assert_called_once_with()
+        thread_conn.close.assert_called_once_with()
+
+    def test_close_reconnects_on_next_call(self):
+        self._target.close()
+        new_conn = MagicMock()
+        self._connect.side_effect = [new_conn]
+
+        self._target.delete('foo')
+
+        self.assertEqual(2, self._connect.call_count)
+        new_conn.__enter__.return_value.execute.assert_called_once_with(
+            'DELETE FROM jobs WHERE id = ?', ('foo',)
+        )
+
+    def test_store_is_not_kept_alive_for_exit(self):
+        store_ref = weakref.ref(self._target)
+
+        del self._target
+        gc.collect()
+
+        self.assertIsNone(store_ref())
+        self._connect.return_value.close.assert_called_once_with()
+
     def test_load_all_yields_nothing_if_empty(self):
         self._conn.execute.return_value = []
 
         results = list(self._target.load_all())
 
         self.assertEqual([], results)
-        self.assertEqual(2, self._connect.call_count)
+        self.assertEqual(1, self._connect.call_count)
         self._connect.assert_called_with(
             'test-file',
             isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            factory=ANY,
+            check_same_thread=False
         )
-        self._conn.execute.assert_called_with('SELECT * FROM jobs')
+        self._conn.execute.assert_called_with('SELECT id, data FROM jobs')
 
     def test_load_all_rows(self):
         self._conn.execute.return_value = [
@@ -205,87 +276,76 @@ class SQLiteStoreTests(unittest.TestCase):
             {'id': 'bar', 'b': 2},
             {'id': 'baz', 'c': 3},
         ], results)
-        self.assertEqual(2, self._connect.call_count)
+        self.assertEqual(1, self._connect.call_count)
         self._connect.assert_called_with(
             'test-file',
             isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            factory=ANY,
+            check_same_thread=False
         )
-        self._conn.execute.assert_called_with('SELECT * FROM jobs')
+        self._conn.execute.assert_called_with('SELECT id, data FROM jobs')
 
     def test_create(self):
         data = {'a': 1}
 
         self._target.create('test-id', data)
 
-        self.assertEqual(2, self._connect.call_count)
+        self.assertEqual(1, self._connect.call_count)
         self._connect.assert_called_with(
             'test-file',
             isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            factory=ANY,
+            check_same_thread=False
         )
         self._conn.execute.assert_called_with(
             'INSERT INTO jobs VALUES (?, ?)', ('test-id', data)
         )
 
-    def test_update_adds_new_values(self):
-        self._conn.execute.return_value.fetchone.return_value = (
-            'test-id',
-            {'a': 1},
-        )
-        data = {'b': 2}
+    def test_update_sets_values(self):
+        data = {'b': 2, 'c': {'d': None}}
 
         self._target.update('test-id', data)
 
-        self.assertEqual(2, self._connect.call_count)
-        self._connect.assert_called_with(
-            'test-file',
-            isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        execute_calls = [
-            call('SELECT * FROM jobs WHERE id = ?', ('test-id',)),
-            call(
-                'UPDATE jobs SET data = ? WHERE id = ?',
-                ({'a': 1, 'b': 2}, 'test-id')
-            ),
-        ]
-        # NOTE: skip asserting create table call from __init__
-        self.assertEqual(execute_calls, self._conn.execute.call_args_list[1:])
-
-    def test_update_replaces_values(self):
-        self._conn.execute.return_value.fetchone.return_value = (
-            'test-id',
-            {'a': 1, 'b': 2},
+        self.assertEqual(1, self._connect.call_count)
+        self._conn.execute.assert_called_with(
+            'UPDATE jobs SET data = json_set(data, ?, json(?), ?, json(?))'
+            ' WHERE id = ?',
+            ('$."b"', '2', '$."c"', '{"d":null}', 'test-id')
         )
-        data = {'a': 4}
 
-        self._target.update('test-id', data)
+    def test_update_raises_if_missing_row(self):
+        self._conn.execute.return_value.rowcount = 0
 
-        self.assertEqual(2, self._connect.call_count)
-        self._connect.assert_called_with(
-            'test-file',
-            isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        execute_calls = [
-            call('SELECT * FROM jobs WHERE id = ?', ('test-id',)),
-            call(
-                'UPDATE jobs SET data = ? WHERE id = ?',
-                ({'a': 4, 'b': 2}, 'test-id')
-            ),
-        ]
-        # NOTE: skip asserting create table call from __init__
-        self.assertEqual(execute_calls, self._conn.execute.call_args_list[1:])
+        with self.assertRaises(KeyError):
+            self._target.update('test-id', {'b': 2})
+
+    def test_update_rejects_quoted_field_names(self):
+        self._conn.execute.reset_mock()
+
+        with self.assertRaises(ValueError):
+            self._target.update('test-id', {'b"': 2})
+
+        self._conn.execute.assert_not_called()
+
+    def test_update_skips_empty_values(self):
+        self._conn.execute.reset_mock()
+
+        self._target.update('test-id', {})
+
+        self._conn.execute.assert_not_called()
 
     def test_delete(self):
         self._target.delete('test-id')
 
-        self.assertEqual(2, self._connect.call_count)
+        self.assertEqual(1, self._connect.call_count)
         self._connect.assert_called_with(
             'test-file',
             isolation_level=None,
-            detect_types=sqlite3.PARSE_DECLTYPES
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            factory=ANY,
+            check_same_thread=False
         )
         self._conn.execute.assert_called_with(
             'DELETE FROM jobs WHERE id = ?', ('test-id',)
@@ -294,32 +354,42 @@ class SQLiteStoreTests(unittest.TestCase):
 
 class S3StoreTests(unittest.TestCase):
     def setUp(self):
-        with patch('boto3.resource') as self._res, \
-                patch('boto3.client') as self._client:
+        with patch('boto3.resource') as self._res:
             bn = 'test-bucket'
             self._bucket = self._res.return_value.Bucket.return_value
             self._bucket.name = bn
+            self._client = self._res.return_value.meta.client
             self._target = S3Store(bn)
 
+    def _set_objects(self, objects):
+        self._bucket.objects.filter.return_value = [
+            Mock(key=key) for key in objects
+        ]
+        self._client.get_object.side_effect = lambda **kwargs: {
+            'Body': BytesIO(objects[kwargs['Key']])
+        }
+
+    def _use_prefix(self, prefix):
+        with patch('boto3.resource', self._res):
+            self._target = S3Store(self._bucket.name, prefix)
+
     def test_init(self):
         self._res.return_value.Bucket.assert_called_with('test-bucket')
-        self._client.return_value.head_bucket.assert_called_with(
+        self._client.head_bucket.assert_called_with(
             Bucket='test-bucket'
         )
         self._bucket.create.assert_not_called()
 
     @patch.object(logging.getLogger('ecs_scheduler.persistence'), 'warning')
     def test_init_creates_bucket_if_not_found(self, warning):
-        with patch('boto3.resource') as res, \
-                patch('boto3.client') as c, \
-                patch('boto3.session.Session') as s:
+        with patch('boto3.resource') as res:
             bucket = res.return_value.Bucket.return_value
-            c.return_value.head_bucket.side_effect = \
+            client = res.return_value.meta.client
+            client.head_bucket.side_effect = \
                 botocore.exceptions.ClientError(
                     {'Error': {'Code': '404'}}, 'fake_operation'
                 )
-            session = s.return_value
-            session.region_name = 'test-region'
+            client.meta.region_name = 'test-region'
             S3Store('test-bucket', 'test-prefix')
 
         bucket.create.assert_called_with(
@@ -330,10 +400,10 @@ class S3StoreTests(unittest.TestCase):
 
     @patch.object(logging.getLogger('ecs_scheduler.persistence'), 'warning')
     def test_init_raises_unknown_errors(self, warning):
-        with patch('boto3.resource') as res, \
-                patch('boto3.client') as c:
+        with patch('boto3.resource') as res:
             bucket = res.return_value.Bucket.return_value
-            c.return_value.head_bucket.side_effect = \
+            client = res.return_value.meta.client
+            client.head_bucket.side_effect = \
                 botocore.exceptions.ClientError(
                     {'Error': {'Code': '500'}}, 'fake_operation'
                 )
@@ -352,11 +422,11 @@ class S3StoreTests(unittest.TestCase):
         self._bucket.objects.filter.assert_called_with(Prefix='')
 
     def test_load_all_yields_json_objects_from_root_bucket(self):
-        self._bucket.objects.filter.return_value = [
-            Mock(key='foo.json', get=lambda: {'Body': BytesIO(b'{"a": 1}')}),
-            Mock(key='bar.json', get=lambda: {'Body': BytesIO(b'{"b": 2}')}),
-            Mock(key='baz.json', get=lambda: {'Body': BytesIO(b'{"c": 3}')}),
-        ]
+        self._set_objects({
+            'foo.json': b'{"a": 1}',
+            'bar.json': b'{"b": 2}',
+            'baz.json': b'{"c": 3}',
+        })
 
         results = list(self._target.load_all())
 
@@ -369,16 +439,17 @@ class S3StoreTests(unittest.TestCase):
         self._bucket.objects.filter.assert_called_with(Prefix='')
 
     def test_load_all_ignores_other_bucket_contents(self):
-        self._bucket.objects.filter.return_value = [
-            Mock(key='foo.json', get=lambda: {'Body': BytesIO(b'{"a": 1}')}),
-            Mock(key='a-prefix/'),
-            Mock(key='bar.json', get=lambda: {'Body': BytesIO(b'{"b": 2}')}),
-            Mock(key='another-prefix/'),
-            Mock(key='baz.json', get=lambda: {'Body': BytesIO(b'{"c": 3}')}),
-            Mock(key='another-prefix/foo.json'),
-            Mock(key='bort.txt'),
-            Mock(key='a-file'),
-        ]
+        self._set_objects({
+            'foo.json': b'{"a": 1}',
+            'a-prefix/': None,
+            'bar.json': b'{"b": 2}',
+            'another-prefix/': None,
+            'baz.json': b'{"c": 3}',
+            'another-prefix/foo.json': None,
+            'bort.txt': None,
+            'a-file': None,
+            '.json': None,
+        })
 
         results = list(self._target.load_all())
 
@@ -390,8 +461,39 @@ class S3StoreTests(unittest.TestCase):
         self.assertCountEqual(expected, results)
         self._bucket.objects.filter.assert_called_with(Prefix='')
 
+    def test_load_all_gets_objects_with_client(self):
+        self._set_objects({'foo.json': b'{"a": 1}'})
+
+        list(self._target.load_all())
+
+        self._client.get_object.assert_called_once_with(
+            Bucket='test-bucket', Key='foo.json'
+        )
+
+    def test_load_all_raises_object_errors(self):
+        self._set_objects({'foo.json': b'{"a": 1}', 'bar.json': None})
+        self._client.get_object.side_effect = RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            list(self._target.load_all())
+
+    @patch('concurrent.futures.ThreadPoolExecutor')
+    def test_load_all_cancels_pending_loads_on_error(self, executor):
+        self._set_objects({'foo.json': b'{"a": 1}', 'bar.json': b'{"b": 2}'})
+        failed, pending = Mock(), Mock()
+        failed.result.side_effect = RuntimeError
+        executor.return_value.__enter__.return_value.submit.side_effect = [
+            failed, pending
+        ]
+
+        with self.assertRaises(RuntimeError):
+            list(self._target.load_all())
+
+        pending.result.assert_not_called()
+        pending.cancel.assert_called_once_with()
+
     def test_load_all_prefix_yields_nothing_if_empty(self):
-        self._target._prefix = 'test-prefix'
+        self._use_prefix('test-prefix')
 
         results = list(self._target.load_all())
 
@@ -399,21 +501,12 @@ class S3StoreTests(unittest.TestCase):
         self._bucket.objects.filter.assert_called_with(Prefix='test-prefix')
 
     def test_load_all_prefix_yields_json_objects(self):
-        self._target._prefix = 'test-prefix'
-        self._bucket.objects.filter.return_value = [
-            Mock(
-                key='test-prefix/foo.json',
-                get=lambda: {'Body': BytesIO(b'{"a": 1}')}
-            ),
-            Mock(
-                key='test-prefix/bar.json',
-                get=lambda: {'Body': BytesIO(b'{"b": 2}')}
-            ),
-            Mock(
-                key='test-prefix/baz.json',
-                get=lambda: {'Body': BytesIO(b'{"c": 3}')}
-            ),
-        ]
+        self._use_prefix('test-prefix')
+        self._set_objects({
+            'test-prefix/foo.json': b'{"a": 1}',
+            'test-prefix/bar.json': b'{"b": 2}',
+            'test-prefix/baz.json': b'{"c": 3}',
+        })
 
         results = list(self._target.load_all())
 
@@ -426,21 +519,12 @@ class S3StoreTests(unittest.TestCase):
         self._bucket.objects.filter.assert_called_with(Prefix='test-prefix')
 
     def test_load_all_prefix_works_if_prefix_contains_slash(self):
-        self._target._prefix = 'test-prefix/'
-        self._bucket.objects.filter.return_value = [
-            Mock(
-                key='test-prefix/foo.json',
-                get=lambda: {'Body': BytesIO(b'{"a": 1}')}
-            ),
-            Mock(
-                key='test-prefix/bar.json',
-                get=lambda: {'Body': BytesIO(b'{"b": 2}')}
-            ),
-            Mock(
-                key='test-prefix/baz.json',
-                get=lambda: {'Body': BytesIO(b'{"c": 3}')}
-            ),
-        ]
+        self._use_prefix('test-prefix/')
+        self._set_objects({
+            'test-prefix/foo.json': b'{"a": 1}',
+            'test-prefix/bar.json': b'{"b": 2}',
+            'test-prefix/baz.json': b'{"c": 3}',
+        })
 
         results = list(self._target.load_all())
 
@@ -453,26 +537,17 @@ class S3StoreTests(unittest.TestCase):
         self._bucket.objects.filter.assert_called_with(Prefix='test-prefix/')
 
     def test_load_all_prefix_ignores_subfolders(self):
-        self._target._prefix = 'test-prefix'
-        self._bucket.objects.filter.return_value = [
-            Mock(
-                key='test-prefix/foo.json',
-                get=lambda: {'Body': BytesIO(b'{"a": 1}')}
-            ),
-            Mock(key='a-prefix/'),
-            Mock(
-                key='test-prefix/bar.json',
-                get=lambda: {'Body': BytesIO(b'{"b": 2}')}
-            ),
-            Mock(key='another-prefix/'),
-            Mock(
-                key='test-prefix/baz.json',
-                get=lambda: {'Body': BytesIO(b'{"c": 3}')}
-            ),
-            Mock(key='another-prefix/foo.json'),
-            Mock(key='bort.txt'),
-            Mock(key='a-file'),
-        ]
+        self._use_prefix('test-prefix')
+        self._set_objects({
+            'test-prefix/foo.json': b'{"a": 1}',
+            'a-prefix/': None,
+            'test-prefix/bar.json': b'{"b": 2}',
+            'another-prefix/': None,
+            'test-prefix/baz.json': b'{"c": 3}',
+            'another-prefix/foo.json': None,
+            'bort.txt': None,
+            'a-file': None,
+        })
 
         results = list(self._target.load_all())
 
@@ -493,10 +568,10 @@ class S3StoreTests(unittest.TestCase):
         self._res.return_value.Object.assert_called_with(
             'test-bucket', 'test-id.json'
         )
-        new_obj.put.assert_called_with(Body=b'{"a": 1}')
+        new_obj.put.assert_called_with(Body=b'{"a":1}')
 
     def test_create_with_prefix(self):
-        self._target._prefix = 'test-prefix'
+        self._use_prefix('test-prefix')
         new_obj = self._res.return_value.Object.return_value
         data = {'a': 1}
 
@@ -505,10 +580,10 @@ class S3StoreTests(unittest.TestCase):
         self._res.return_value.Object.assert_called_with(
             'test-bucket', 'test-prefix/test-id.json'
         )
-        new_obj.put.assert_called_with(Body=b'{"a": 1}')
+        new_obj.put.assert_called_with(Body=b'{"a":1}')
 
     def test_create_with_slashed_prefix(self):
-        self._target._prefix = 'test-prefix/'
+        self._use_prefix('test-prefix/')
         new_obj = self._res.return_value.Object.return_value
         data = {'a': 1}
 
@@ -517,7 +592,7 @@ class S3StoreTests(unittest.TestCase):
         self._res.return_value.Object.assert_called_with(
             'test-bucket', 'test-prefix/test-id.json'
         )
-        new_obj.put.assert_called_with(Body=b'{"a": 1}')
+        new_obj.put.assert_called_with(Body=b'{"a":1}')
 
     def test_update_adds_fields(self):
         up_obj = self._res.return_value.Object.return_value
@@ -529,7 +604,7 @@ class S3StoreTests(unittest.TestCase):
         self._res.return_value.Object.assert_called_with(
             'test-bucket', 'test-id.json'
         )
-        up_obj.put.assert_called_with(Body=b'{"a": 1, "b": 2}')
+        up_obj.put.assert_called_with(Body=b'{"a":1,"b":2}')
 
     def test_update_replace_fields(self):
         up_obj = self._res.return_value.Object.return_value
@@ -541,10 +616,10 @@ class S3StoreTests(unittest.TestCase):
         self._res.return_value.Object.assert_called_with(
             'test-bucket', 'test-id.json'
         )
-        up_obj.put.assert_called_with(Body=b'{"a": 3}')
+        up_obj.put.assert_called_with(Body=b'{"a":3}')
 
     def test_update_with_prefix(self):
-        self._target._prefix = 'test-prefix'
+        self._use_prefix('test-prefix')
         up_obj = self._res.return_value.Object.return_value
         up_obj.get.return_value = {'Body': BytesIO(b'{"a": 1, "b": 2}')}
         updated_data = {'b': 4, 'w': 'foo'}
@@ -554,10 +629,10 @@ class S3StoreTests(unittest.TestCase):
         self._res.return_value.Object.assert_called_with(
             'test-bucket', 'test-prefix/test-id.json'
         )
-        up_obj.put.assert_called_with(Body=b'{"a": 1, "b": 4, "w": "foo"}')
+        up_obj.put.assert_called_with(Body=b'{"a":1,"b":4,"w":"foo"}')
 
     def test_update_with_slashed_prefix(self):
-        self._target._prefix = 'test-prefix/'
+        self._use_prefix('test-prefix/')
         up_obj = self._res.return_value.Object.return_value
         up_obj.get.return_value = {'Body': BytesIO(b'{"a": 1, "b": 2}')}
         updated_data = {'b': 4, 'w': 'foo'}
@@ -567,7 +642,7 @@ class S3StoreTests(unittest.TestCase):
         self._res.return_value.Object.assert_called_with(
             'test-bucket', 'test-prefix/test-id.json'
         )
-        up_obj.put.assert_called_with(Body=b'{"a": 1, "b": 4, "w": "foo"}')
+        up_obj.put.assert_called_with(Body=b'{"a":1,"b":4,"w":"foo"}')
 
     def test_delete(self):
         del_obj = self._res.return_value.Object.return_value
@@ -580,7 +655,7 @@ class S3StoreTests(unittest.TestCase):
         del_obj.delete.assert_called_with()
 
     def test_delete_with_prefix(self):
-        self._target._prefix = 'test-prefix'
+        self._use_prefix('test-prefix')
         del_obj = self._res.return_value.Object.return_value
 
         self._target.delete('test-id')
@@ -591,7 +666,7 @@ class S3StoreTests(unittest.TestCase):
         del_obj.delete.assert_called_with()
 
     def test_delete_with_slashed_prefix(self):
-        self._target._prefix = 'test-prefix/'
+        self._use_prefix('test-prefix/')
         del_obj = self._res.return_value.Object.return_value
 
         self._target.delete('test-id')
@@ -604,12 +679,11 @@ class S3StoreTests(unittest.TestCase):
 
 class DynamoDBStoreTests(unittest.TestCase):
     def setUp(self):
-        with patch('boto3.resource') as self._res, \
-                patch('boto3.client') as client:
+        with patch('boto3.resource') as self._res:
             tablename = 'test-table'
             self._table = self._res.return_value.Table.return_value
             self._table.name = tablename
-            self._dyn_client = client.return_value
+            self._dyn_client = self._table.meta.client
             self._target = DynamoDBStore(tablename)
 
     def test_init(self):
@@ -623,11 +697,10 @@ class DynamoDBStoreTests(unittest.TestCase):
     def test_init_creates_bucket_if_not_found(self, warning):
         # NOTE: this exception type can only be found on a client instance
         ex_type = boto3.client('dynamodb').exceptions.ResourceNotFoundException
-        with patch('boto3.resource') as res, \
-                patch('boto3.client') as c:
-            dyn_c = c.return_value
-            dyn_c.exceptions.ResourceNotFoundException = ex_type
+        with patch('boto3.resource') as res:
             table = res.return_value.Table.return_value
+            dyn_c = table.meta.client
+            dyn_c.exceptions.ResourceNotFoundException = ex_type
             table.name = 'test-table'
             dyn_c.describe_table.side_effect = ex_type(
                 {'Error': {'Code': '404'}}, 'fake_operation'
@@ -648,22 +721,45 @@ class DynamoDBStoreTests(unittest.TestCase):
         table.wait_until_exists.assert_called_with()
         warning.assert_called()
 
+    def _scan_pages(self, pages):
+        def scan(**kwargs):
+            key = kwargs['Segment'], kwargs.get('ExclusiveStartKey')
+            page = pages.get(key, {'Items': []})
+            return {**page, 'Items': [
+                {k: {'S': v} for k, v in item.items()}
+                for item in page['Items']
+            ]}
+        self._dyn_client.scan.side_effect = scan
+
+    def _scan_call(self, segment, **kwargs):
+        return call(
+            TableName='test-table',
+            Segment=segment,
+            TotalSegments=4,
+            ProjectionExpression='#k, #d',
+            ExpressionAttributeNames={'#k': 'job-id', '#d': 'json-data'},
+            **kwargs
+        )
+
     def test_load_all_yields_nothing_if_empty(self):
-        self._table.scan.side_effect = ({'Items': []},)
+        self._scan_pages({})
 
         results = list(self._target.load_all())
 
         self.assertEqual([], results)
-        self._table.scan.assert_called_with()
+        self.assertCountEqual(
+            [self._scan_call(s) for s in range(4)],
+            self._dyn_client.scan.call_args_list
+        )
 
     def test_load_all_yields_one_batch(self):
-        self._table.scan.side_effect = (
-            {'Items': [
+        self._scan_pages({
+            (0, None): {'Items': [
                 {'job-id': 'foo1', 'json-data': '{"a": 1}'},
                 {'job-id': 'foo2', 'json-data': '{"b": 2}'},
                 {'job-id': 'foo3', 'json-data': '{"c": 3}'},
             ]},
-        )
+        })
 
         results = list(self._target.load_all())
 
@@ -673,23 +769,28 @@ class DynamoDBStoreTests(unittest.TestCase):
             {'id': 'foo3', 'c': 3},
         ]
         self.assertEqual(expected_results, results)
-        self.assertEqual([call()], self._table.scan.call_args_list)
+        self.assertCountEqual(
+            [self._scan_call(s) for s in range(4)],
+            self._dyn_client.scan.call_args_list
+        )
 
     def test_load_all_yields_all_batches(self):
-        self._table.scan.side_effect = (
-            {'Items': [
+        self._scan_pages({
+            (0, None): {'Items': [
                 {'job-id': 'foo1', 'json-data': '{"a": 1}'},
                 {'job-id': 'foo2', 'json-data': '{"b": 2}'},
                 {'job-id': 'foo3', 'json-data': '{"c": 3}'},
             ], 'LastEvaluatedKey': 'foo'},
-            {'Items': [
+            (0, 'foo'): {'Items': [
                 {'job-id': 'bar1', 'json-data': '{"d": 4}'},
             ], 'LastEvaluatedKey': 'bar'},
-            {'Items': [
+            (0, 'bar'): {'Items': [
                 {'job-id': 'baz1', 'json-data': '{"e": 5}'},
+            ]},
+            (2, None): {'Items': [
                 {'job-id': 'baz2', 'json-data': '{"f": 6}'},
             ]},
-        )
+        })
 
         results = list(self._target.load_all())
 
@@ -702,11 +803,14 @@ class DynamoDBStoreTests(unittest.TestCase):
             {'id': 'baz2', 'f': 6},
         ]
         self.assertEqual(expected_results, results)
-        self.assertEqual([
-            call(),
-            call(ExclusiveStartKey='foo'),
-            call(ExclusiveStartKey='bar'),
-        ], self._table.scan.call_args_list)
+        self.assertCountEqual([
+            self._scan_call(0),
+            self._scan_call(0, ExclusiveStartKey='foo'),
+            self._scan_call(0, ExclusiveStartKey='bar'),
+            self._scan_call(1),
+            self._scan_call(2),
+            self._scan_call(3),
+        ], self._dyn_client.scan.call_args_list)
 
     def test_create(self):
         data = {'a': 1, 'b': 2}
@@ -714,7 +818,7 @@ class DynamoDBStoreTests(unittest.TestCase):
         self._target.create('test-id', data)
 
         self._table.put_item.assert_called_with(
-            Item={'job-id': 'test-id', 'json-data': '{"a": 1, "b": 2}'}
+            Item={'job-id': 'test-id', 'json-data': '{"a":1,"b":2}'}
         )
 
     def test_update_adds_fields(self):
@@ -727,7 +831,7 @@ class DynamoDBStoreTests(unittest.TestCase):
 
         self._table.get_item.assert_called_with(Key={'job-id': 'test-id'})
         self._table.put_item.assert_called_with(
-            Item={'job-id': 'test-id', 'json-data': '{"a": 1, "b": 2}'}
+            Item={'job-id': 'test-id', 'json-data': '{"a":1,"b":2}'}
         )
 
     def test_update_replaces_fields(self):
@@ -740,7 +844,7 @@ class DynamoDBStoreTests(unittest.TestCase):
 
         self._table.get_item.assert_called_with(Key={'job-id': 'test-id'})
         self._table.put_item.assert_called_with(
-            Item={'job-id': 'test-id', 'json-data': '{"a": 4, "b": 2}'}
+            Item={'job-id': 'test-id', 'json-data': '{"a":4,"b":2}'}
         )
 
     def test_delete(self):
@@ -755,6 +859,26 @@ class ElasticsearchStoreTests(unittest.TestCase):
             self._target = ElasticsearchStore('test_index', foo='bar')
             self._es = es_cls.return_value
 
+    @patch('elasticsearch.Elasticsearch')
+    def test_init_uses_job_serializer(self, es_cls):
+        ElasticsearchStore('test_index', foo='bar')
+
+        serializer = es_cls.call_args.kwargs['serializer']
+        self.assertEqual({'a': 1}, serializer.loads('{"a": 1}'))
+        es_cls.assert_called_with(
+            foo='bar', serializer=serializer, http_compress=True
+        )
+
+    @patch('elasticsearch.Elasticsearch')
+    def test_init_keeps_custom_client_args(self, es_cls):
+        custom = Mock()
+
+        ElasticsearchStore(
+            'test_index', serializer=custom, http_compress=False
+        )
+
+        es_cls.assert_called_with(serializer=custom, http_compress=False)
+
     @patch('elasticsearch.Elasticsearch')
     def test_init_does_not_create_index_if_present(self, es_cls):
         es = es_cls.return_value
@@ -799,7 +923,7 @@ class ElasticsearchStoreTests(unittest.TestCase):
         self.assertEqual([], results)
         info.assert_called()
         scan.assert_called_with(
-            client=self._es, index='test_index', scroll='1m'
+            client=self._es, index='test_index', scroll='1m', size=5000
         )
 
     @patch('elasticsearch.helpers.scan')
@@ -839,7 +963,7 @@ class ElasticsearchStoreTests(unittest.TestCase):
         self.assertCountEqual(expected, results)
         info.assert_called()
         scan.assert_called_with(
-            client=self._es, index='test_index', scroll='1m'
+            client=self._es, index='test_index', scroll='1m', size=5000
         )
 
     def test_create(self):
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, ANY
 
 from ecs_scheduler.triggers import (
     NoOpTrigger, SqsTrigger, get, init, _triggers
@@ -34,13 +34,52 @@ class NoOpTriggerTests(unittest.TestCase):
 
 class SqsTriggerTests(unittest.TestCase):
     def setUp(self):
-        with patch('boto3.resource'):
+        with patch('boto3.resource') as self._resource:
             self._trigger = SqsTrigger()
+        self._client = self._trigger._sqs.meta.client
+        self._client.get_queue_url.return_value = {
+            'QueueUrl': 'https://sqs.test/testQueue'
+        }
+
+    def _set_message_count(self, count):
+        self._client.get_queue_attributes.return_value = {
+            'Attributes': {'ApproximateNumberOfMessages': str(count)}
+        }
+
+    def test_init_uses_adaptive_retries(self):
+        self._resource.assert_called_with('sqs', config=ANY)
+        config = self._resource.call_args.kwargs['config']
+        self.assertEqual('adaptive', config.retries['mode'])
+
+    def test_determine_task_count_queries_queue_attributes(self):
+        test_data = {'taskCount': 10, 'trigger': {'queueName': 'testQueue'}}
+        self._set_message_count(0)
+
+        self._trigger.determine_task_count(test_data)
+
+        self._client.get_queue_url.assert_called_once_with(
+            QueueName='testQueue'
+        )
+        self._client.get_queue_attributes.assert_called_once_with(
+            QueueUrl='https://sqs.test/testQueue',
+            AttributeNames=['ApproximateNumberOfMessages']
+        )
+
+    def test_determine_task_count_caches_queue_url(self):
+        test_data = {'taskCount': 10, 'trigger': {'queueName': 'testQueue'}}
+        self._set_message_count(0)
+
+        self._trigger.determine_task_count(test_data)
+        self._trigger.determine_task_count(test_data)
+
+        self._client.get_queue_url.assert_called_once_with(
+            QueueName='testQueue'
+        )
+        self.assertEqual(2, self._client.get_queue_attributes.call_count)
 
     def test_determine_task_count_returns_zero_if_no_messages(self):
         test_data = {'taskCount': 10, 'trigger': {'queueName': 'testQueue'}}
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 0})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(0)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -50,8 +89,7 @@ class SqsTriggerTests(unittest.TestCase):
         self
     ):
         test_data = {'taskCount': 10, 'trigger': {'queueName': 'testQueue'}}
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 1})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(1)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -63,8 +101,7 @@ class SqsTriggerTests(unittest.TestCase):
             'trigger': {'queueName': 'testQueue'},
             'maxCount': 7,
         }
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 1})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(1)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -77,8 +114,7 @@ class SqsTriggerTests(unittest.TestCase):
             'taskCount': 1,
             'trigger': {'queueName': 'testQueue', 'messagesPerTask': 10},
         }
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 40})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(40)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -90,8 +126,7 @@ class SqsTriggerTests(unittest.TestCase):
             'trigger': {'queueName': 'testQueue', 'messagesPerTask': 10},
             'maxCount': 2,
         }
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 40})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(40)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -102,8 +137,7 @@ class SqsTriggerTests(unittest.TestCase):
             'taskCount': 1,
             'trigger': {'queueName': 'testQueue', 'messagesPerTask': 10},
         }
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 41})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(41)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -114,8 +148,7 @@ class SqsTriggerTests(unittest.TestCase):
             'taskCount': 1,
             'trigger': {'queueName': 'testQueue', 'messagesPerTask': 10},
         }
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 10})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(10)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -126,8 +159,7 @@ class SqsTriggerTests(unittest.TestCase):
             'taskCount': 1,
             'trigger': {'queueName': 'testQueue', 'messagesPerTask': 10},
         }
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 2})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(2)
 
         count = self._trigger.determine_task_count(test_data)
 
@@ -140,8 +172,7 @@ class SqsTriggerTests(unittest.TestCase):
             'taskCount': 3,
             'trigger': {'queueName': 'testQueue', 'messagesPerTask': 10},
         }
-        fake_queue = Mock(attributes={'ApproximateNumberOfMessages': 10})
-        self._trigger._sqs.get_queue_by_name.return_value = fake_queue
+        self._set_message_count(10)
 
         count = self._trigger.determine_task_count(test_data)
 